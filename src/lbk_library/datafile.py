@@ -5,19 +5,47 @@ File:       datafile.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.1.0
+Version:    1.3.0
 """
 
+import functools
 import sqlite3
+from contextlib import contextmanager
 from traceback import print_exc
-from typing import Any
+from typing import Any, Iterator
 
-file_version = "1.1.0"
+file_version = "1.3.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed name from 'Dbal' to 'DataFile'.",
+    "1.2.0": "Added 'sql_executemany' and 'sql_executescript'.",
+    "1.3.0": "Cached the statements built by 'sql_query_from_array', larger"
+    " prepared statement cache, added 'transaction' and 'sql_insert',"
+    " 'new_file' runs its PRAGMAs first and the rest in one transaction,"
+    " 'sql_executescript' runs its statements one at a time.",
 }
 
+# the number of compiled statements each connection keeps for reuse,
+# sqlite3 defaults to 128
+_STATEMENT_CACHE_SIZE = 256
+
+
+def _strip_leading_comments(sql: str) -> str:
+    """
+    Remove the comments and white space in front of a sql statement.
+
+    Parameters:
+        sql (str): the sql statement.
+
+    Returns:
+        (str) the statement from its first keyword on.
+    """
+    sql = sql.lstrip()
+    while sql.startswith(("--", "/*")):
+        end_mark = "\n" if sql.startswith("--") else "*/"
+        sql = sql.partition(end_mark)[2].lstrip()
+    return sql
+
 
 class DataFile:
     """
@@ -35,6 +63,12 @@ class DataFile:
         """
         Create and initialize the new DataFile.
 
+        PRAGMA statements in the definition are run first, as some
+        cannot run inside a transaction, so they are run ahead of the
+        other statements wherever they are in the list. A statement is
+        a PRAGMA if it starts with 'PRAGMA' after any leading comments.
+        The other statements are then run, in order, in one transaction.
+
         Parameters:
             filename (str): full path to the datafile file to be created.
             sql_statements (list[str]): the sql definition of the
@@ -42,8 +76,13 @@ class DataFile:
         """
         datafile = DataFile()
         datafile.sql_connect(filename)
+        statements = []
         for sql in sql_statements:
-            datafile.sql_query(sql)
+            if _strip_leading_comments(sql)[:6].upper() == "PRAGMA":
+                datafile.sql_query(sql)
+            else:
+                statements.append(sql)
+        datafile.sql_executescript(statements)
         return datafile
 
     def __init__(self) -> None:
@@ -52,6 +91,8 @@ class DataFile:
         """Full path to the datafile in use."""
         self.__connection: sqlite3.Connection = None
         """Sqlite3 datafile connection object."""
+        self.__transaction_depth: int = 0
+        """Number of open 'transaction' blocks, no commits while > 0."""
 
     def sql_connect(self, datafile: str) -> bool:
         """
@@ -69,7 +110,9 @@ class DataFile:
         self.datafile_name = datafile
         return_value = False
         try:
-            self.__connection = sqlite3.connect(self.datafile_name)
+            self.__connection = sqlite3.connect(
+                self.datafile_name, cached_statements=_STATEMENT_CACHE_SIZE
+            )
             # set the row to be a dictionary (map or associative array)
             self.__connection.row_factory = self.__dict_factory
             return_value = True
@@ -104,13 +147,158 @@ class DataFile:
             if self.__connection:
                 query_result = self.__connection.cursor()
                 query_result.execute(query, values)
-                self.__connection.commit()
+                if not self.__transaction_depth:
+                    self.__connection.commit()
         except sqlite3.OperationalError:
             query_result = None  # sqlite3.Cursor()
             self._sql_error(query)
             raise sqlite3.OperationalError
         return query_result
 
+    def sql_insert(self, table: str, value_set: dict[str, Any]) -> sqlite3.Cursor:
+        """
+        Insert one row into a table.
+
+        The INSERT statement is built once for each table and set of
+        value_set keys, then reused.
+
+        Parameters:
+            table (str): name of the table.
+            value_set (dict[str, Any]): the column name: value pairs to
+                insert.
+
+        Returns:
+            (sqlite3.Cursor) the query result status if query succeeded,
+                 None Otherwise
+        Raises:
+            sqlite3.OperationalError: if query is not valid
+        """
+        sql = self.__insert_statement(table, tuple(value_set))
+        return self.sql_query(sql, value_set)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def __insert_statement(table: str, columns: tuple[str, ...]) -> str:
+        """
+        Build the INSERT statement once for each table and columns.
+
+        Parameters:
+            table (str): name of the table.
+            columns (tuple[str, ...]): the column names, in order.
+
+        Returns:
+            (str) INSERT sql statement.
+        """
+        return DataFile.__sql_insert_statement(
+            {"type": "insert", "table": table}, dict.fromkeys(columns)
+        )
+
+    def sql_executemany(self, query: str, value_sets: list[dict]) -> sqlite3.Cursor:
+        """
+        Execute a sql datafile query once for each set of values.
+
+        All the statements are run in a single transaction which is
+        committed once at the end.
+
+        Parameters:
+            query (str): Contains the SQL query statement which shall be
+                executed.
+            value_sets (list[dict]): The name: values pairs to insert
+                into the query, one dict for each execution.
+
+        Returns:
+            (sqlite3.Cursor) the query result status if query succeeded,
+                 None Otherwise
+        Raises:
+            sqlite3.OperationalError: if query is not valid
+        """
+        query_result = None
+        try:
+            if self.__connection:
+                query_result = self.__connection.cursor()
+                query_result.executemany(query, value_sets)
+                if not self.__transaction_depth:
+                    self.__connection.commit()
+        except sqlite3.OperationalError:
+            query_result = None
+            self._sql_error(query)
+            raise sqlite3.OperationalError
+        return query_result
+
+    def sql_executescript(self, sql_statements: list[str]) -> sqlite3.Cursor:
+        """
+        Execute a set of sql statements as a single transaction.
+
+        The statements are run one at a time in one transaction which is
+        committed once at the end, or rolled back if a statement fails.
+        Inside a 'transaction' block the statements become part of the
+        block and are committed or rolled back with it.
+
+        PRAGMA statements that cannot run inside a transaction, such as
+        'journal_mode', must not be passed in; run them with sql_query
+        first.
+
+        Parameters:
+            sql_statements (list[str]): the SQL statements to execute,
+                one statement per entry; they cannot use named values.
+
+        Returns:
+            (sqlite3.Cursor) the query result status if the statements
+                succeeded, None Otherwise
+        Raises:
+            sqlite3.OperationalError: if a statement is not valid
+        """
+        query_result = None
+        if not self.__connection:
+            return query_result
+        query_result = self.__connection.cursor()
+        in_block = bool(self.__transaction_depth)
+        statement = ""
+        try:
+            if not in_block:
+                query_result.execute("BEGIN")
+            for statement in sql_statements:
+                query_result.execute(statement)
+            if not in_block:
+                self.__connection.commit()
+        except sqlite3.OperationalError:
+            query_result = None
+            if not in_block:
+                self.__connection.rollback()
+            self._sql_error(statement)
+            raise sqlite3.OperationalError
+        except sqlite3.Error:
+            # any other failure must not leave the transaction open
+            if not in_block:
+                self.__connection.rollback()
+            raise
+        return query_result
+
+    @contextmanager
+    def transaction(self) -> Iterator["DataFile"]:
+        """
+        Run a block of statements as a single transaction.
+
+        Within the block sql_query and sql_executemany do not commit.
+        The block's changes are committed together when it ends, or
+        rolled back if an exception leaves it. Blocks may be nested,
+        only the outermost block commits or rolls back.
+
+        Returns:
+            (Iterator[DataFile]) this datafile, for use in the block.
+        """
+        self.__transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.__transaction_depth -= 1
+            if not self.__transaction_depth and self.__connection:
+                self.__connection.rollback()
+            raise
+        self.__transaction_depth -= 1
+        if not self.__transaction_depth and self.__connection:
+            self.__connection.commit()
+
     def _sql_error(self, sql_text: str = "") -> None:
         """
         Display the error.
@@ -245,26 +433,73 @@ class DataFile:
 
         Returns:
             (str) The results of building the statement. An empty string
-                will be returned if the query is not a dictionary or the
-                type is not one of DELETE, INSERT, UPDATE or SELECT.
+                will be returned if the query is not a dictionary, the
+                type is not one of DELETE, INSERT, UPDATE or SELECT, or
+                an INSERT has a missing or empty value_set.
         """
         if not isinstance(query, dict):
-            sql = ""
+            return ""
+
+        # the statement depends only on the query and the value_set keys
+        query_items = tuple(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in query.items()
+        )
+        value_keys = tuple(value_set) if value_set else ()
+        try:
+            hash(query_items)
+        except TypeError:  # an unhashable query entry, build uncached
+            return self.__build_statement(query, value_set)
+        return self.__cached_statement(query_items, value_keys)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def __cached_statement(query_items: tuple, value_keys: tuple) -> str:
+        """
+        Build the sql statement once for each query and value_set keys.
+
+        Parameters:
+            query_items (tuple): the query as (key, value) pairs, list
+                values as tuples.
+            value_keys (tuple): the value_set keys, in order.
+
+        Returns:
+            (str) The sql statement.
+        """
+        return DataFile.__build_statement(dict(query_items), dict.fromkeys(value_keys))
+
+    @staticmethod
+    def __build_statement(query: dict, value_set: dict) -> str:
+        """
+        Build the sql statement for a query.
+
+        Parameters:
+            query (dict): the query, as for sql_query_from_array.
+            value_set (dict): holds the parameters needed in building
+                the sql statement.
+
+        Returns:
+            (str) The sql statement, empty if the type is not one of
+                DELETE, INSERT, UPDATE or SELECT, or for an INSERT with
+                no value_set.
+        """
+        sql = query["type"].upper()
+        if sql == "DELETE":
+            sql = DataFile.__sql_delete_statement(query)
+        elif sql == "INSERT":
+            sql = ""  # there is nothing to insert without values
+            if value_set:
+                sql = DataFile.__sql_insert_statement(query, value_set)
+        elif sql == "SELECT":
+            sql = DataFile.__sql_select_statement(query)
+        elif sql == "UPDATE":
+            sql = DataFile.__sql_update_statement(query, value_set)
         else:
-            sql = query["type"].upper()
-            if sql == "DELETE":
-                sql = self.__sql_delete_statement(query)
-            elif sql == "INSERT":
-                sql = self.__sql_insert_statement(query, value_set)
-            elif sql == "SELECT":
-                sql = self.__sql_select_statement(query)
-            elif sql == "UPDATE":
-                sql = self.__sql_update_statement(query, value_set)
-            else:
-                sql = ""  # Bad type, not one of DELETE, INSERT, SELECT, or UPDATE
+            sql = ""  # Bad type, not one of DELETE, INSERT, SELECT, or UPDATE
         return sql
 
-    def __sql_delete_statement(self, query: dict) -> str:
+    @staticmethod
+    def __sql_delete_statement(query: dict) -> str:
         """
         Build the sql DELETE statement.
 
@@ -288,7 +523,8 @@ class DataFile:
             sql += " WHERE "  # illegal where clause
         return sql
 
-    def __sql_insert_statement(self, query: dict, value_set: dict[str, Any]) -> str:
+    @staticmethod
+    def __sql_insert_statement(query: dict, value_set: dict[str, Any]) -> str:
         """
         Build the sql INSERT query statement.
 
@@ -316,7 +552,8 @@ class DataFile:
         sql += columns + " VALUES " + placeholder
         return sql
 
-    def __sql_select_statement(self, query: dict) -> str:
+    @staticmethod
+    def __sql_select_statement(query: dict) -> str:
         """
         Build the sql SELECT query statement.
 
@@ -377,7 +614,8 @@ class DataFile:
 
         return sql
 
-    def __sql_update_statement(self, query: dict, value_set: dict) -> str:
+    @staticmethod
+    def __sql_update_statement(query: dict, value_set: dict) -> str:
         """
         Build the sql UPDATE query statement.
 
@@ -5,7 +5,7 @@ File:       element.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.1.0
 """
 
 from copy import deepcopy
@@ -14,9 +14,10 @@ from typing import Any
 from .datafile import DataFile
 from .validate import Validate
 
-file_version = "1.0.0"
+file_version = "1.1.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "'add' uses the cached DataFile.sql_insert statement, added 'reset'.",
 }
 
 
@@ -117,12 +118,7 @@ class Element:
         return_value = False
         property_set = self.get_properties()
         property_set["record_id"] = None  # new entry id will be assigned
-        query = {
-            "type": "insert",
-            "table": self.get_table(),
-        }
-        sql = self.get_datafile().sql_query_from_array(query, property_set)
-        result = self.get_datafile().sql_query(sql, property_set)
+        result = self.get_datafile().sql_insert(self.get_table(), property_set)
         if result:
             return_value = self.__datafile.sql_nextid(result)
             property_set["record_id"] = return_value
@@ -527,3 +523,23 @@ class Element:
     def clear_value_valid_flags(self) -> None:
         """Clear the set of 'valid' flags."""
         self.__properties_valid.clear()
+
+    def reset(self, default_values: dict[str, Any] = None) -> None:
+        """
+        Return the element to its newly constructed state.
+
+        The properties and the changed and valid flags are cleared and
+        the initial values are set from the defaults. The datafile and
+        table are kept, so the element can be reused for another record.
+
+        Parameters:
+            default_values (dict[str, Any]): a new set of default values
+                for this element, default is None. If not given, the
+                current defaults are kept.
+        """
+        if default_values:
+            self._defaults = default_values
+        self.__properties = {}
+        self.clear_value_changed_flags()
+        self.clear_value_valid_flags()
+        self.set_initial_values(self._defaults)
@@ -5,23 +5,27 @@ File:       dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2020 - 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.0
+Version:    1.2.0
 """
 
-from typing import Callable
+from __future__ import annotations
 
-from PySide6.QtWidgets import QComboBox, QDialog, QMainWindow, QMessageBox
+from typing import TYPE_CHECKING, Callable
 
-from lbk_library import DataFile, Element
+from PySide6.QtWidgets import QComboBox, QDialog, QMainWindow, QMessageBox
 
 from .combo_box import ComboBox
 from .line_edit import LineEdit
 
-file_version = "1.1.0"
+if TYPE_CHECKING:
+    from lbk_library import DataFile, Element
+
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.0.1": "Moved Dialog from lbk_library to lbk_library.gui",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6'",
+    "1.2.0": "Message boxes are built by one helper, type only imports.",
 }
 
 
@@ -95,7 +99,7 @@ class Dialog(QDialog):
         """
         self.__element = element
 
-    def get_operation(self) -> DataFile:
+    def get_operation(self) -> int:
         """
         Get the current editing operation.
 
@@ -153,11 +157,12 @@ class Dialog(QDialog):
         Returns:
             (bool) True if dialog is closed, False if not.
         """
-        if self.get_element().have_values_changed():
+        element = self.get_element()
+        if element.have_values_changed():
             msg_box = self.message_question_changed_close("Dialog Entries")
             result = self.message_box_exec(msg_box)
             if result == QMessageBox.StandardButton.Yes:
-                if self.get_element().is_element_valid():
+                if element.is_element_valid():
                     save_action(action)  # save and close dialog
                     return self.close()
                 else:
@@ -226,7 +231,7 @@ class Dialog(QDialog):
             if not dialog_widget.error:
                 self.error_count += 1
             dialog_widget.error = True
-            dialog_widget.setToolTip(result["msg"] + "; " + tooltip)
+            dialog_widget.setToolTip(f"{result['msg']}; {tooltip}")
         return result
 
     def message_information_close(self, msg_text: str) -> None:
@@ -239,12 +244,11 @@ class Dialog(QDialog):
         Returns:
             (QMessageBox) The 'informational' message box ready for display.
         """
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Information,
             "Success",
             msg_text,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            self,
         )
 
     def message_question_changed_close(self, changed_name: str) -> None:
@@ -257,14 +261,13 @@ class Dialog(QDialog):
         Return:
             (QMessageBox) The 'changed' message box ready for display.
         """
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Question,
-            changed_name + " Changed",
+            f"{changed_name} Changed",
             "Do you want to save the current changes before closing form?",
             QMessageBox.StandardButton.Yes
             | QMessageBox.StandardButton.No
             | QMessageBox.StandardButton.Cancel,
-            self,
         )
 
     def message_question_changed(self, changed_name: str) -> None:
@@ -277,14 +280,13 @@ class Dialog(QDialog):
         Returns:
             (QMessageBox) The 'changed' message box ready for display.
         """
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Question,
-            changed_name + " Changed",
-            "Do you want to save the current" + " changes before reloading form?",
+            f"{changed_name} Changed",
+            "Do you want to save the current changes before reloading form?",
             QMessageBox.StandardButton.Yes
             | QMessageBox.StandardButton.No
             | QMessageBox.StandardButton.Cancel,
-            self,
         )
 
     def message_question_no_changes(self) -> None:
@@ -294,12 +296,11 @@ class Dialog(QDialog):
         Returns:
             (QMessageBox) The 'warning' message box ready for display.
         """
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Question,
             "Form Entries Have Not Changed",
             "Nothing has changed, so nothing to save",
             QMessageBox.StandardButton.Ok,
-            self,
         )
 
     def message_warning_selection(self, name: str, action: str):
@@ -316,12 +317,11 @@ class Dialog(QDialog):
         Returns:
             (QMessageBox) The 'warning' message box ready for display.
         """
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Warning,
-            name + " not selected",
-            "Nothing to " + action,
+            f"{name} not selected",
+            f"Nothing to {action}",
             QMessageBox.StandardButton.Ok,
-            self,
         )
 
     def message_warning_failed(self, operation: str) -> None:
@@ -334,12 +334,11 @@ class Dialog(QDialog):
         Returns:
             (QMessageBox) The 'warning' message box ready for display.
         """
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Warning,
-            operation + " Operation Failed",
-            "The " + operation + " operation failed for some reason.",
+            f"{operation} Operation Failed",
+            f"The {operation} operation failed for some reason.",
             QMessageBox.StandardButton.Ok,
-            self,
         )
 
     def message_warning_invalid(self, msg_text: str = "") -> None:
@@ -355,16 +354,40 @@ class Dialog(QDialog):
         """
         text = "Please correct the highlighted errors"
         if msg_text:
-            text = text + "\n" + msg_text
+            text = f"{text}\n{msg_text}"
 
-        return QMessageBox(
+        return self._message_box(
             QMessageBox.Icon.Warning,
             "Form Entries Invalid",
             text,
             QMessageBox.StandardButton.Ok,
-            self,
         )
 
+    def _message_box(
+        self,
+        icon: QMessageBox.Icon,
+        title: str,
+        text: str,
+        buttons: QMessageBox.StandardButton,
+    ) -> QMessageBox:
+        """
+        Build a message box for a new message.
+
+        Each message gets a new box. A reused box would carry whatever a
+        caller changed on it, such as informative text, default or
+        escape buttons and added buttons, into the next message.
+
+        Parameters:
+            icon (QMessageBox.Icon): the message icon.
+            title (str): the message box window title.
+            text (str): the message text.
+            buttons (QMessageBox.StandardButton): the buttons to show.
+
+        Returns:
+            (QMessageBox) The message box ready for display.
+        """
+        return QMessageBox(icon, title, text, buttons, self)
+
     def message_box_exec(self, message_box: QMessageBox) -> QMessageBox.StandardButton:
         """
         Return the result of executing a prepare message box.
@@ -5,30 +5,33 @@ File:       error_frame.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.0
+Version:    1.2.0
 """
 
 from PySide6.QtCore import Property
 from PySide6.QtWidgets import QFrame, QWidget
 
-file_version = "1.1.0"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6'",
+    "1.2.0": "Shared style sheets, only restyle when the error status changes",
 }
 
 
 class ErrorFrame(QFrame):
     """An error indicating frame holding a single widget."""
 
+    # style sheets for frame, shared by all frames
+    _frame_style_error = "QFrame { border: 2px solid red; border-radius: 0;}"
+    """The frame style when the contained entry is in error."""
+    _frame_style_normal = "QFrame { border: 2px white; border-radius: 0;}"
+    """The frame style when the contained entry is valid."""
+
     def __init__(self, parent: QWidget = None) -> None:
         self._error = False
         """Is the contained entry valid."""
 
-        # style sheets for frame
-        self._frame_style_error = "QFrame { border: 2px solid red; border-radius: 0;}"
-        self._frame_style_normal = "QFrame { border: 2px white; border-radius: 0;}"
-
         super().__init__(parent)
         self.setStyleSheet(self._frame_style_normal)
 
@@ -40,8 +43,10 @@ class ErrorFrame(QFrame):
     @error.setter
     def error(self, value: bool) -> None:
         """Set the error status"""
+        # restyling makes Qt re-parse the style sheet, skip if unchanged.
+        if bool(value) != bool(self._error):
+            if value:
+                self.setStyleSheet(self._frame_style_error)
+            else:
+                self.setStyleSheet(self._frame_style_normal)
         self._error = value
-        if value:
-            self.setStyleSheet(self._frame_style_error)
-        else:
-            self.setStyleSheet(self._frame_style_normal)
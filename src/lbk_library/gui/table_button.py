@@ -7,6 +7,7 @@ Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
+from PySide6.QtCore import Slot
 from PySide6.QtWidgets import QPushButton, QTableWidget
 
 
@@ -40,6 +41,7 @@ class TablePushButton(QPushButton):
         self.setAutoDefault(False)
         self.clicked.connect(self.button_clicked)
 
+    @Slot()
     def button_clicked(self) -> None:
         """
         Redirect the button's "clicked" signal to the table's
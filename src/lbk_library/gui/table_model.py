@@ -9,20 +9,44 @@ File:       table_model.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.1
+Version:    1.1.0
 """
 
-from typing import Any
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
-from PySide6.QtGui import QBrush  # , QColor
+from PySide6.QtCore import QAbstractItemModel, QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
 
 file_version = "1.1.0"
 changes = {
     "1.0.0": "Initial release",
     "1.0.1": "Added Version Info",
+    "1.1.0": "Role lookup table, role scoped signals, shared default background,"
+    " slotted CellData, lazily loaded rows",
 }
 
+_DISPLAY_ROLE: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole
+"""The display role, bound once for the per-cell comparisons."""
+_EDIT_ROLE: Qt.ItemDataRole = Qt.ItemDataRole.EditRole
+"""The edit role, bound once for the per-cell comparisons."""
+
+_ROLE_ATTRIBUTES: dict[Qt.ItemDataRole, str] = {
+    _DISPLAY_ROLE: "value",
+    _EDIT_ROLE: "value",
+    Qt.ItemDataRole.ToolTipRole: "tooltip",
+    Qt.ItemDataRole.BackgroundRole: "background",
+    Qt.ItemDataRole.TextAlignmentRole: "alignment",
+}
+"""The CellData attribute holding the information for each supported role."""
+
+_LAYOUT_SIGNATURE: tuple[str, str] = (
+    "QList<QPersistentModelIndex>",
+    "QAbstractItemModel::LayoutChangeHint",
+)
+"""The layout signal overload that carries a layout change hint."""
+
 
 class CellData:
     """
@@ -33,6 +57,9 @@ class CellData:
     public and directly accessable. No error checking is performed.
     """
 
+    # a table holds one CellData per cell, so drop the per-instance dict.
+    __slots__ = ("value", "alignment", "background", "tooltip")
+
     def __init__(
         self,
         value: Any = None,
@@ -55,6 +82,117 @@ class CellData:
         self.tooltip = tooltip
 
 
+class _LazyRows:
+    """
+    Provides the rows of a TableModel on demand.
+
+    Rows are built from a row provider the first time they are
+    requested and kept in a bounded least recently used cache. Rows
+    that have been edited are kept until the model is discarded so
+    changes are not lost when the row leaves the cache.
+    """
+
+    def __init__(
+        self,
+        provider: Callable[[int], list[Any]],
+        row_count: int,
+        column_tooltips: list[str],
+        column_alignments: list[Qt.AlignmentFlag],
+        background: QBrush,
+        cache_size: int,
+    ) -> None:
+        """
+        Initialize the lazy row set.
+
+        Parameters:
+            provider (Callable[[int], list[Any]]): returns the cell
+                values for a zero based row number.
+            row_count (int): the number of rows in the table.
+            column_tootips {list[str]): The tooltips in column order.
+            column_alignments {list[Qt.AlignmentFlag]): The text
+                alignement in column order.
+            background (Qbrush): The table cell background color.
+            cache_size (int): the number of unedited rows to keep.
+        """
+        self._provider: Callable[[int], list[Any]] = provider
+        """Builds the cell values for a row."""
+        self._row_count: int = row_count
+        """The number of rows in the table."""
+        self._column_tooltips: list[str] = column_tooltips
+        """The tooltips in column order."""
+        self._column_alignments: list[Qt.AlignmentFlag] = column_alignments
+        """The text alignments in column order."""
+        self._background: QBrush = background
+        """The cell background color."""
+        self._cache_size: int = cache_size
+        """The maximum number of unedited rows kept in the cache."""
+        self._row_cache: OrderedDict[int, list[CellData]] = OrderedDict()
+        """The most recently used unedited rows, oldest first."""
+        self._edited_rows: dict[int, list[CellData]] = {}
+        """The rows that have been changed through the model."""
+
+    def __len__(self) -> int:
+        """
+        Get the number of rows.
+
+        Returns:
+            (int) the number of rows in the table.
+        """
+        return self._row_count
+
+    def __getitem__(self, row: int) -> list[CellData]:
+        """
+        Get the cells of a row, building them if needed.
+
+        Parameters:
+            row (int): the zero based row number.
+
+        Returns:
+            (list[CellData]) the cells of the row.
+        """
+        cells = self._edited_rows.get(row)
+        if cells is None:
+            cells = self._row_cache.get(row)
+            if cells is None:
+                if not 0 <= row < self._row_count:
+                    raise IndexError("row index out of range")
+                cells = [
+                    CellData(value, alignment, self._background, tooltip)
+                    for value, alignment, tooltip in zip(
+                        self._provider(row),
+                        self._column_alignments,
+                        self._column_tooltips,
+                    )
+                ]
+                self._row_cache[row] = cells
+                if len(self._row_cache) > self._cache_size:
+                    self._row_cache.popitem(last=False)
+            else:
+                self._row_cache.move_to_end(row)
+        return cells
+
+    def pin(self, row: int) -> list[CellData]:
+        """
+        Keep a row that is being changed out of the cache eviction.
+
+        The row must be pinned before it is changed, otherwise the
+        change may be made to a row that has already been dropped from
+        the cache.
+
+        Parameters:
+            row (int): the zero based row number.
+
+        Returns:
+            (list[CellData]) the cells of the pinned row.
+        """
+        cells = self._edited_rows.get(row)
+        if cells is None:
+            cells = self[row]
+            self._edited_rows[row] = cells
+            self._row_cache.pop(row, None)
+        return cells
+
+
 class TableModel(QAbstractTableModel):
     """
     Provides access to QTableView derived tables.
@@ -64,13 +202,28 @@ class TableModel(QAbstractTableModel):
     native format to match this data setup.
     """
 
+    _default_brush: QBrush | None = None
+    """The shared default cell background, created on first use."""
+
+    @classmethod
+    def _default_background(cls) -> QBrush:
+        """
+        Get the shared default cell background.
+
+        Returns:
+            (QBrush) the white background brush shared by all tables.
+        """
+        if cls._default_brush is None:
+            cls._default_brush = QBrush(QColor("white"))
+        return cls._default_brush
+
     def __init__(
         self,
         cell_values: list[list[str]],
         header_titles: list[str],
         column_tooltips: list[str],
         column_alignments: list[Qt.AlignmentFlag],
-        background: QBrush,
+        background: QBrush | None = None,
     ) -> None:
         """
         Initialize the TableModel.
@@ -87,23 +240,88 @@ class TableModel(QAbstractTableModel):
                 default is QBrush(QColor("White")).
 
         """
-        self._data_set: list[list[dict[str, Any]]] = []
+        self._data_set: list[list[CellData]] = []
         """The set of cell information to diaplay to display."""
         self._header_titles: list[str] = header_titles
         """ The set of Header Titles."""
+        self._ncols: int = len(cell_values[0]) if cell_values else 0
+        """The number of data columns in each row of the data set."""
+        self._bulk_depth: int = 0
+        """The nesting depth of bulk updates in progress."""
+        self._bulk_top_left: tuple[int, int] | None = None
+        """The (row, column) of the top left cell changed in a bulk update."""
+        self._bulk_bottom_right: tuple[int, int] | None = None
+        """The (row, column) of the bottom right cell changed in a bulk
+            update."""
+        self._bulk_roles: set[int] = set()
+        """The roles changed in a bulk update."""
 
         super().__init__()
-        for row in range(len(cell_values)):
-            self._data_set.append([])
-            for column in range(len(cell_values[0])):
-                self._data_set[row].append(
-                    CellData(
-                        cell_values[row][column],
-                        column_alignments[column],
-                        background,
-                        column_tooltips[column],
-                    )
+        if background is None:
+            background = self._default_background()
+        self._data_set = [
+            [
+                CellData(value, alignment, background, tooltip)
+                for value, alignment, tooltip in zip(
+                    row_values, column_alignments, column_tooltips
                 )
+            ]
+            for row_values in cell_values
+        ]
+
+    @classmethod
+    def from_provider(
+        cls,
+        provider: Callable[[int], list[Any]],
+        row_count: int,
+        header_titles: list[str],
+        column_tooltips: list[str],
+        column_alignments: list[Qt.AlignmentFlag],
+        background: QBrush | None = None,
+        cache_size: int = 512,
+    ) -> "TableModel":
+        """
+        Create a TableModel that loads its rows on demand.
+
+        Rows are requested from the provider only when the view asks
+        for them, and the most recently used rows are cached. Rows
+        cannot be inserted into or removed from the model.
+
+        Parameters:
+            provider (Callable[[int], list[Any]]): returns the cell
+                values, in column order, for a zero based row number.
+            row_count (int): the number of rows in the table.
+            header_titles (list[str]): The names of the table columns.
+            column_tootips {list[str]): The tooltips in column order for
+                each column in the table.
+            column_alignments {list[Qt.AlignmentFlag]): The text
+                alignement in column order for each column in the table.
+            background (Qbrush): The table cell background color,
+                default is QBrush(QColor("White")).
+            cache_size (int): the number of unedited rows to keep,
+                default is 512.
+
+        Returns:
+            (TableModel) the new table model.
+
+        Raises:
+            ValueError if cache_size is less than 1.
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        model = cls([], header_titles, column_tooltips, column_alignments, background)
+        if background is None:
+            background = cls._default_background()
+        model._ncols = len(column_alignments)
+        model._data_set = _LazyRows(
+            provider,
+            row_count,
+            column_tooltips,
+            column_alignments,
+            background,
+            cache_size,
+        )
+        return model
 
     def data(
         self, index: QModelIndex, role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole
@@ -125,22 +343,19 @@ class TableModel(QAbstractTableModel):
                 (str) The data item requested.
         """
         entry = None
+        column = index.column()
         # handle the situation where number of data columns is less than
         # number of table columns.
-        if index.column() >= len(self._data_set[0]):
-            pass
+        if index.isValid() and column < self._ncols:
+            cell = self._data_set[index.row()][column]
 
-        elif role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-            entry = self._data_set[index.row()][index.column()].value
-
-        elif role == Qt.ItemDataRole.ToolTipRole:
-            entry = self._data_set[index.row()][index.column()].tooltip
-
-        elif role == Qt.ItemDataRole.BackgroundRole:
-            entry = self._data_set[index.row()][index.column()].background
-
-        elif role == Qt.ItemDataRole.TextAlignmentRole:
-            entry = self._data_set[index.row()][index.column()].alignment
+            # the display value is by far the most requested role.
+            if role == _DISPLAY_ROLE or role == _EDIT_ROLE:
+                entry = cell.value
+            else:
+                attribute = _ROLE_ATTRIBUTES.get(role)
+                if attribute is not None:
+                    entry = getattr(cell, attribute)
 
         return entry
 
@@ -173,35 +388,150 @@ class TableModel(QAbstractTableModel):
             (bool) True if successful; otherwise returns False.
 
         Signals:
-            Emits dataChanged signal if set_data() is successful.
+            Emits dataChanged signal, limited to the changed role, if
+            set_data() is successful. During a bulk update, the signal
+            is deferred until the update ends.
         """
         success = False
+        row = index.row()
+        column = index.column()
 
         # handle the situation where number data columns is less than
         # number of table columns.
-        if index.column() >= len(self._data_set[0]):
-            success = True
-
-        elif role == Qt.ItemDataRole.EditRole or role == Qt.ItemDataRole.DisplayRole:
-            self._data_set[index.row()][index.column()].value = value
-            success = True
-
-        elif role == Qt.ItemDataRole.ToolTipRole:
-            self._data_set[index.row()][index.column()].tooltip = value
-            success = True
+        if not index.isValid():
+            pass
 
-        elif role == Qt.ItemDataRole.BackgroundRole:
-            self._data_set[index.row()][index.column()].background = value
+        elif column >= self._ncols:
             success = True
 
-        elif role == Qt.ItemDataRole.TextAlignmentRole:
-            self._data_set[index.row()][index.column()].alignment = value
-            success = True
+        else:
+            attribute = _ROLE_ATTRIBUTES.get(role)
+            if attribute is not None:
+                if isinstance(self._data_set, _LazyRows):
+                    # pin first so the change goes to the kept row
+                    cells = self._data_set.pin(row)
+                else:
+                    cells = self._data_set[row]
+                setattr(cells[column], attribute, value)
+                success = True
 
         if success:
-            self.dataChanged.emit(index, index)
+            if self._bulk_depth:
+                self._extend_bulk_region(row, column)
+                self._bulk_roles.add(role)
+            else:
+                self.dataChanged.emit(index, index, [role])
         return success
 
+    def begin_bulk_update(self) -> None:
+        """
+        Start a bulk update of the table cells.
+
+        While a bulk update is in progress, setData() does not emit the
+        dataChanged signal for each cell. Instead, a single dataChanged
+        signal covering all the changed cells is emitted by the matching
+        end_bulk_update(). Bulk updates may be nested.
+        """
+        self._bulk_depth += 1
+
+    def end_bulk_update(self) -> None:
+        """
+        End a bulk update of the table cells.
+
+        When the outermost bulk update ends, a single dataChanged signal
+        is emitted for the rectangle bounding all the changed cells,
+        limited to the roles that were changed.
+
+        Signals:
+            Emits dataChanged signal if any cell was changed.
+        """
+        if self._bulk_depth > 0:
+            self._bulk_depth -= 1
+        if self._bulk_depth == 0 and self._bulk_top_left is not None:
+            top_left = self.createIndex(*self._bulk_top_left)
+            bottom_right = self.createIndex(*self._bulk_bottom_right)
+            roles = sorted(self._bulk_roles)
+            self._bulk_top_left = None
+            self._bulk_bottom_right = None
+            self._bulk_roles.clear()
+            self.dataChanged.emit(top_left, bottom_right, roles)
+
+    @contextmanager
+    def bulk_update(self) -> Iterator["TableModel"]:
+        """
+        Wrap a set of setData() calls in a bulk update.
+
+        Usage:
+            with model.bulk_update():
+                for row, column, value in new_values:
+                    model.setData(model.index(row, column), value)
+
+        Returns:
+            (Iterator[TableModel]) this model for the 'with' statement.
+        """
+        self.begin_bulk_update()
+        try:
+            yield self
+        finally:
+            self.end_bulk_update()
+
+    @contextmanager
+    def layout_update(
+        self,
+        hint: QAbstractItemModel.LayoutChangeHint = (
+            QAbstractItemModel.LayoutChangeHint.VerticalSortHint
+        ),
+    ) -> Iterator["TableModel"]:
+        """
+        Wrap a rearrangement of the table rows in a layout change.
+
+        Views keep their current items and only re-query the layout
+        rather than resetting the whole model.
+
+        Usage:
+            with model.layout_update(), model.bulk_update():
+                for row, values in enumerate(sorted_rows):
+                    for column, value in enumerate(values):
+                        model.setData(model.index(row, column), value)
+
+        Parameters:
+            hint (QAbstractItemModel.LayoutChangeHint): the kind of
+                layout change, defaults to VerticalSortHint.
+
+        Returns:
+            (Iterator[TableModel]) this model for the 'with' statement.
+
+        Signals:
+            Emits layoutAboutToBeChanged on entry and layoutChanged on
+            exit.
+        """
+        self.layoutAboutToBeChanged[_LAYOUT_SIGNATURE].emit([], hint)
+        try:
+            yield self
+        finally:
+            self.layoutChanged[_LAYOUT_SIGNATURE].emit([], hint)
+
+    def _extend_bulk_region(self, row: int, column: int) -> None:
+        """
+        Extend the changed region of a bulk update to include a cell.
+
+        Parameters:
+            row (int): the row of the changed cell.
+            column (int): the column of the changed cell.
+        """
+        if self._bulk_top_left is None:
+            self._bulk_top_left = (row, column)
+            self._bulk_bottom_right = (row, column)
+        else:
+            self._bulk_top_left = (
+                min(row, self._bulk_top_left[0]),
+                min(column, self._bulk_top_left[1]),
+            )
+            self._bulk_bottom_right = (
+                max(row, self._bulk_bottom_right[0]),
+                max(column, self._bulk_bottom_right[1]),
+            )
+
     def rowCount(self, index: QModelIndex = QModelIndex()) -> int:
         """
         Get the number of rows (elements in the data set).
@@ -243,7 +573,12 @@ class TableModel(QAbstractTableModel):
             (Qt.ItemFlags) The flags for the specific cell.
         """
         flags = super().flags(index)
-        if self._header_titles[index.column()] != "Record Id":
+        column = index.column()
+        if (
+            index.isValid()
+            and column < len(self._header_titles)
+            and self._header_titles[column] != "Record Id"
+        ):
             flags = flags | Qt.ItemFlag.ItemIsEditable
         return flags
 
@@ -270,7 +605,8 @@ class TableModel(QAbstractTableModel):
             The current text contents of the header cell.
         """
         entry = None
-        if role == Qt.ItemDataRole.DisplayRole and section < self.columnCount():
+        # bound directly on the titles rather than through columnCount().
+        if role == _DISPLAY_ROLE and 0 <= section < len(self._header_titles):
             entry = self._header_titles[section]
         return entry
 
@@ -300,7 +636,7 @@ class TableModel(QAbstractTableModel):
             Emits headerDataChanged signal if set is successful.
         """
         success = False
-        if role == Qt.ItemDataRole.DisplayRole:
+        if role == _DISPLAY_ROLE:
             self._header_titles[section] = value
             success = True
             self.headerDataChanged.emit(orientation, section, section)
@@ -319,32 +655,53 @@ class TableModel(QAbstractTableModel):
             parent (QModelIndex): The parent node of the row position to
                 insert, default is the empty index.
         Returns:
-            (bool) True if the insert was successful, False if not.
+            (bool) True if the insert was successful, False if not. Rows
+                cannot be inserted into a model created by from_provider().
         """
         success = False
-        self.beginRemoveRows(parent, row, row + count - 1)
-        count_added = 0
-        while count_added < count:
-            self._data_set.insert(
-                row, [CellData() for i in range(len(self._header_titles))]
-            )
-            count_added += 1
-        success = True
-        self.endInsertRows()
+        if not isinstance(self._data_set, _LazyRows):
+            if not self._data_set:
+                self._ncols = len(self._header_titles)
+            columns = self._ncols
+            self.beginInsertRows(parent, row, row + count - 1)
+            # splice in the full block of new rows at once.
+            self._data_set[row:row] = [
+                [CellData() for column in range(columns)] for new_row in range(count)
+            ]
+            success = True
+            self.endInsertRows()
         return success
 
     def removeRows(
         self, first_row: int, count: int, parent: QModelIndex = QModelIndex()
     ) -> bool:
         """
-        Need to implement this to delete rows for the table.
+        Remove one or more rows from the table.
+
+        Parameters:
+            first_row (int): The zero based row number of the first row
+                to remove.
+            count (int): the number (1 or greater) of rows to remove.
+            parent (QModelIndex): The parent node of the rows to remove,
+                default is the empty index.
+
+        Returns:
+            (bool) True if the rows were removed, False if the rows are
+                not all in the table. Rows cannot be removed from a
+                model created by from_provider().
         """
         success = False
-        self.beginRemoveRows(parent, first_row, first_row + count)
-        count_deleted = 0
-        while count_deleted < count:
-            del self._data_set[first_row]
-            count_deleted += 1
-        success = True
-        self.endRemoveRows()
+        last_row = first_row + count - 1
+        end_row = last_row + 1
+        if (
+            not isinstance(self._data_set, _LazyRows)
+            and count > 0
+            and 0 <= first_row
+            and last_row < len(self._data_set)
+        ):
+            self.beginRemoveRows(parent, first_row, last_row)
+            # drop the full block of rows at once.
+            del self._data_set[first_row:end_row]
+            success = True
+            self.endRemoveRows()
         return success
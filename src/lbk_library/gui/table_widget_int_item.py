@@ -8,19 +8,44 @@ File:       table_widget_int_item.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.0
+Version:    1.2.0
 """
 
+from typing import Any
+
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QTableWidgetItem
 
-file_version = "1.1.0"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6'",
+    "1.2.0": "Cache the integer value used for sort comparisons, add __slots__",
 }
 
 
+def _int_or_none(value: Any) -> int | None:
+    """
+    Convert a value to the integer its text represents.
+
+    Parameters:
+        value (Any) the value to convert.
+
+    Returns:
+        (int | None) the integer, or None if the text of the value is
+            not an integer, such as '2.9'.
+    """
+    try:
+        return int(str(value))
+    except ValueError:
+        return None
+
+
 class TableWidgetIntItem(QTableWidgetItem):
+    # the wrapper keeps a __dict__, so other attributes can still be set,
+    # but the slot keeps it empty; a table holds one item per cell.
+    __slots__ = ("_int_value",)
+
     def __init__(self, integer_value: int) -> None:
         """
         Initalize a TableWidget item with an integer value.
@@ -31,8 +56,23 @@ class TableWidgetIntItem(QTableWidgetItem):
         new_type = 1001
         """Set a unique type for the Table WidgetItem"""
 
+        self._int_value: int | None = _int_or_none(integer_value)
+        """The integer value used when comparing items"""
+
         super().__init__(str(integer_value), new_type)
 
+    def setData(self, role: int, value: Any) -> None:
+        """
+        Set the data for the given role, keeping the cached integer current.
+
+        Parameters:
+            role (int) the Qt.ItemDataRole being set.
+            value (Any) the new value for the role.
+        """
+        super().setData(role, value)
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            self._int_value = _int_or_none(value)
+
     def __lt__(self, other):
         """
         Provides the boolean less than test for integer table widget items.
@@ -40,6 +80,10 @@ class TableWidgetIntItem(QTableWidgetItem):
         Returns:
             (Boolen) True if this item is less than the other item, False otherwise.
         """
-        value = int(self.text())
-        other_value = int(other.text())
+        value = self._int_value
+        if value is None:
+            value = int(self.text())
+        other_value = getattr(other, "_int_value", None)
+        if other_value is None:
+            other_value = int(other.text())
         return value < other_value
@@ -10,10 +10,23 @@ License:    see License
 """
 
 import configparser
+import io
+import locale
 import os
 import sys
 from typing import Any
 
+_PLATFORM_CONFIG_BASE: str = ""
+"""The standard, platform dependent, config directory for lbk_software."""
+if sys.platform.startswith("linux"):
+    _PLATFORM_CONFIG_BASE = os.path.join(
+        os.path.expanduser("~"), ".config", "lbk_software"
+    )
+elif sys.platform.startswith("win"):
+    _PLATFORM_CONFIG_BASE = os.path.join(
+        os.path.expanduser("~"), "AppData", "Local", "lbk_software"
+    )
+
 
 class IniFileParser:
     """
@@ -51,10 +64,10 @@ class IniFileParser:
                 config directory location is not desired for some
                 reason. (testing primarily)
         """
-        home_dir = os.path.expanduser("~")
-
         self.config_file: str = ""
         """The full path to the ini file """
+        self._cache: tuple[tuple[int, int], dict[str, Any]] | None = None
+        """The (mtime, size) of the ini file when last read, and its contents"""
 
         # set the program config sub-dirirectory if not present
         if not program_config_subdir:
@@ -62,23 +75,15 @@ class IniFileParser:
 
         # set the full path to the program config file directiory
         if not config_dir:
-            if sys.platform.startswith("linux"):
-                config_dir = os.path.join(
-                    home_dir, ".config", "lbk_software", program_config_subdir
-                )
-            elif sys.platform.startswith("win"):
-                config_dir = os.path.join(
-                    home_dir, "AppData", "Local", "lbk_software", program_config_subdir
-                )
-
+            if _PLATFORM_CONFIG_BASE:
+                config_dir = os.path.join(_PLATFORM_CONFIG_BASE, program_config_subdir)
         else:
             config_dir = os.path.join(config_dir, program_config_subdir)
 
         # if no path to config file, create path
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir, 0o744)
+        os.makedirs(config_dir, 0o744, exist_ok=True)
 
-            # build the absolute file name.
+        # build the absolute file name.
         self.config_file = os.path.join(config_dir, filename)
 
     def read_config(self) -> dict[str, Any]:
@@ -88,32 +93,116 @@ class IniFileParser:
         Everything is treated as a string, so any numbers or booleans
         will need to be converted separately.
 
+        The file is read as utf-8. A file that is not valid utf-8, such
+        as one saved in the locale encoding by an older release, is read
+        in the locale encoding instead.
+
+        The settings are kept and reused until the file's modification
+        time or size changes. An outside edit that keeps the same size
+        within one tick of the file system clock is not seen.
+
         Returns:
             (dict) The saved configuration settings. If the config file
             does not exist, returns an empty dict object
         """
-        config: dict[str, Any] = {}
-        config_parser = configparser.ConfigParser(allow_no_value=True)
+        try:
+            file_stat = os.stat(self.config_file)
+        except FileNotFoundError:
+            return {}
+
+        # reuse the last read if the file has not changed since
+        file_key = (file_stat.st_mtime_ns, file_stat.st_size)
+        if self._cache is None or self._cache[0] != file_key:
+            try:
+                config_parser = self._read_file("utf-8")
+            except UnicodeDecodeError:
+                config_parser = self._read_file(locale.getpreferredencoding(False))
+            self._cache = (
+                file_key,
+                {
+                    section: dict(config_parser.items(section))
+                    for section in config_parser.sections()
+                },
+            )
+
+        # hand out copies so callers cannot alter the cached settings
+        return {section: dict(values) for section, values in self._cache[1].items()}
+
+    def _read_file(self, encoding: str) -> configparser.ConfigParser:
+        """
+        Read the config file with the given encoding.
 
-        # read the file
-        if os.path.exists(self.config_file):
-            config_parser.read_file(open(self.config_file, "r"))
-            for section in config_parser.sections():
-                config[section] = {}
-                for key in config_parser[section]:
-                    config[section][key] = config_parser[section].get(key)
-        return config
+        Parameters:
+            encoding: (str) the text encoding of the file.
+
+        Returns:
+            (ConfigParser) the parser holding the file's settings.
+        """
+        config_parser = configparser.ConfigParser(allow_no_value=True)
+        with open(self.config_file, "r", encoding=encoding) as config_file:
+            config_parser.read_file(config_file)
+        return config_parser
 
     def write_config(self, new_config: dict[str, Any]) -> None:
         """
         Save the config values to the file.
 
+        Plain settings are written directly in the configparser file
+        format. Settings that need configparser's checks (a 'DEFAULT'
+        section, keys that differ only in case, or '%' interpolation
+        characters) are passed through configparser. The settings are
+        formatted and checked before the file is opened, so a rejected
+        write leaves the file as it was.
+
         Parameters:
             new_config: (dict) The new configuration settings to save.
         """
-        config_parser = configparser.ConfigParser(allow_no_value=True)
-        config_parser.read_dict(new_config)
-        config_parser.write(open(self.config_file, "w"))
+        lines = self._format_config(new_config)
+        if lines is None:
+            # rejected settings raise here, before the file is touched
+            config_parser = configparser.ConfigParser(allow_no_value=True)
+            config_parser.read_dict(new_config)
+            config_text = io.StringIO()
+            config_parser.write(config_text)
+            lines = [config_text.getvalue()]
+        with open(self.config_file, "w", encoding="utf-8") as config_file:
+            config_file.write("".join(lines))
+        self._cache = None
+
+    @staticmethod
+    def _format_config(new_config: dict[str, Any]) -> list[str] | None:
+        """
+        Format the settings as the lines configparser would write.
+
+        Parameters:
+            new_config: (dict) The configuration settings to format.
+
+        Returns:
+            (list[str] | None) the lines of the ini file, or None if the
+            settings need to go through configparser.
+        """
+        lines: list[str] = []
+        for section, values in new_config.items():
+            section = str(section)
+            if section == configparser.DEFAULTSECT:
+                return None
+            lines.append(f"[{section}]\n")
+            keys: set[str] = set()
+            for key, value in values.items():
+                key = str(key).lower()
+                if key in keys:
+                    return None
+                keys.add(key)
+                if value is None:
+                    lines.append(f"{key}\n")
+                else:
+                    value = str(value)
+                    if "%" in value:
+                        return None
+                    value = value.replace("\n", "\n\t")
+                    lines.append(f"{key} = {value}\n")
+            lines.append("\n")
+        return lines
 
     def config_path(self) -> str:
         """
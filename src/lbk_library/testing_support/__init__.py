@@ -10,9 +10,11 @@ Values Available:
     long_string - A string exceeding the base 255 character upper limit.
 
 Filesystem, Directories and associated files:
-    directories (list): List of directories for the filesystem.
+    directories (tuple): The directories for the filesystem.
     filesystem(tmp_path): Pytest fixture to generate a temporary
         filesystem.
+    make_filesystem(tmp_path): Function to generate the filesystem in a
+        given directory, for use outside pytest fixtures.
 Data File Handling:
     datafile_open(: Function to open a database in temporary file system
         returning a reference to the database.
@@ -27,7 +29,7 @@ File:       __init__.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.1
+Version:    1.0.2
 """
 
 from .core_setup import (
@@ -37,11 +39,13 @@ from .core_setup import (
     filesystem,
     load_datafile_table,
     long_string,
+    make_filesystem,
     test_string,
 )
 
-file_version = "1.0.1"
+file_version = "1.0.2"
 changes = {
     "1.0.0": "Initial release",
     "1.0.1": "Added version info.",
+    "1.0.2": "Added 'make_filesystem'.",
 }
@@ -10,9 +10,11 @@ Values Available:
     long_string - A string exceeding the base 255 character upper limit.
 
 Filesystem, Directories and associated files:
-    directories (list): List of directories for the filesystem.
+    directories (tuple): The directories for the filesystem.
     filesystem(tmp_path): Pytest fixture to generate a temporary
         filesystem.
+    make_filesystem(tmp_path): Function to generate the filesystem in a
+        given directory, for use outside pytest fixtures.
 Data File Handling:
     datafile_open(: Function to open a database in temporary file system
         returning a reference to the database.
@@ -27,31 +29,51 @@ File:       core_setup.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.1"""
+Version:    1.0.3"""
+
+from pathlib import Path
+from typing import Final
 
 import pytest
 
 from lbk_library import DataFile
 
-file_version = "1.0.1"
+file_version = "1.0.3"
 changes = {
     "1.0.0": "Initial release",
     "1.0.1": "Added version info.",
+    "1.0.2": "Simplified building the shared test values, added 'make_filesystem'.",
+    "1.0.3": "Test datafiles skip the rollback journal file and disk syncs.",
 }
 
 # Directories for Windows and Linux
-directories = [
+directories: Final[tuple[str, ...]] = (
     ".config",
     "Documents",
     "Documents/parts_tracker",
-]
+)
+
+# the directories that are not the parent of another directory; making
+# these with their parents builds the full set.
+_leaf_directories: Final[tuple[str, ...]] = tuple(
+    directory
+    for directory in directories
+    if not any(other.startswith(directory + "/") for other in directories)
+)
 
 # some test strings
-test_string = "This is a string"
+test_string: Final[str] = "This is a string"
 
-long_string = ""
-while len(long_string) < 255:
-    long_string = long_string + ", " + test_string
+# the shortest run of ", " + test_string reaching 255 characters.
+_long_string_unit = ", " + test_string
+long_string: Final[str] = _long_string_unit * -(-255 // len(_long_string_unit))
+
+# test datafiles are thrown away, so they need no crash safety.
+_test_datafile_pragmas: Final[tuple[str, ...]] = (
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+)
 
 
 @pytest.fixture
@@ -70,13 +92,27 @@ def filesystem(tmp_path):
     Returns:
         (str) The temporary test base directory..
     """
-    base_dir = tmp_path / "base_dir"
-    base_dir.mkdir()
+    return make_filesystem(tmp_path)
 
-    # make a set of base_dir directories and files
-    for directory in directories:
-        a_dir = base_dir / directory
-        a_dir.mkdir()
+
+def make_filesystem(tmp_path: Path) -> str:
+    """
+    Make the test filesystem in a given directory.
+
+    'base_dir' is created in the given directory with the set of
+    'directories' below it.
+
+    Parameters:
+        tmp_path (Path): the directory to hold the filesystem.
+
+    Returns:
+        (str) The test base directory.
+    """
+    base_dir = Path(tmp_path) / "base_dir"
+
+    # make the base_dir directories
+    for directory in _leaf_directories:
+        (base_dir / directory).mkdir(parents=True)
 
     return str(base_dir)
 
@@ -110,6 +146,9 @@ def datafile_create(filepath: str, datafile_definition: str):
     """
     Create a new, empty datafile.
 
+    The connection keeps its rollback journal in memory and does not
+    sync to disk.
+
     Parameters:
         filepath (DataFile): The full path to the requested datafile.
 
@@ -117,8 +156,10 @@ def datafile_create(filepath: str, datafile_definition: str):
          (DataFile) reference to the opened datafile.
     """
     datafile = datafile_open(filepath)
-    for sql in datafile_definition:
-        datafile.sql_query(sql)
+    # these cannot be changed inside the script's transaction
+    for pragma in _test_datafile_pragmas:
+        datafile.sql_query(pragma)
+    datafile.sql_executescript(datafile_definition)
     return datafile
 
 
@@ -133,11 +174,8 @@ def load_datafile_table(datafile, table_name, column_names, value_set):
         value_set list[dict[str, Any]]): the set of values.
     """
     sql_query = {"type": "INSERT", "table": table_name}
-    for values in value_set:
-        entries = {}
-        i = 0
-        while i < len(column_names):
-            entries[column_names[i]] = values[i]
-            i += 1
-        sql = datafile.sql_query_from_array(sql_query, entries)
-        datafile.sql_query(sql, entries)
+    # the INSERT statement only depends on the column names.
+    sql = datafile.sql_query_from_array(sql_query, dict.fromkeys(column_names))
+    datafile.sql_executemany(
+        sql, [dict(zip(column_names, values)) for values in value_set]
+    )
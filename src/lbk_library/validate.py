@@ -5,16 +5,133 @@ File:       validate.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.1
+Version:    1.2.0
 """
 
 import datetime
+import functools
 import re
 import sys
-from typing import Any, Union
+from typing import Any, Callable, Union
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.0.1": "Added Version Info.",
+    "1.1.0": "Precompiled the validation patterns, cached reg_exp_field patterns,"
+    " date layouts and integer strings checked without regular expressions,"
+    " boolean set lookups.",
+    "1.2.0": "Added reg_exp_validator, Validate instances have no __dict__,"
+    " dates checked against a month length table.",
+}
+
+# validation patterns, compiled once
+_FLOAT_RE = re.compile(r"^[+-]?\ *(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+"""An optionally signed decimal or exponential float."""
+
+# accepted boolean entries
+_TRUE_STATES = frozenset((True, "true", "on", "1"))
+"""The entries accepted as True; 1 is equal to True."""
+_FALSE_STATES = frozenset((False, "false", "off", "0"))
+"""The entries accepted as False; 0 is equal to False."""
+
+# date field layouts, the (minimum, maximum) digits of each field
+_SLASH_DATE_WIDTHS = ((1, 2), (1, 2), (4, 4))
+"""A date of form mm/dd/yyyy, month and day of one or two digits."""
+_DASH_DATE_WIDTHS = ((4, 4), (1, 2), (1, 2))
+"""A date of form yyyy-mm-dd, month and day of one or two digits."""
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+"""The days in each month of a common year."""
+
+
+def _split_date(
+    date_input: str, separator: str, widths: tuple[tuple[int, int], ...]
+) -> list[str] | None:
+    """
+    Split a date into its numeric fields.
+
+    Parameters:
+        date_input (str): the date to split.
+        separator (str): the separator between the date fields.
+        widths (tuple[tuple[int, int], ...]): the (minimum, maximum)
+            number of digits in each field.
+
+    Returns:
+        (list[str] | None) the date fields, or None if the date does not
+            have the given layout.
+    """
+    date_parts = None
+    if separator in date_input:
+        parts = date_input.split(separator)
+        if len(parts) == len(widths) and all(
+            part.isdecimal() and low <= len(part) <= high
+            for part, (low, high) in zip(parts, widths)
+        ):
+            date_parts = parts
+    return date_parts
+
+
+def _is_valid_date(year: int, month: int, day: int) -> bool:
+    """
+    Test a year, month and day for a valid date.
+
+    Gives the same answer as constructing a datetime.date, without
+    building the object or raising on an invalid date.
+
+    Parameters:
+        year (int): the year, 1 or later.
+        month (int): the month, 1 to 12.
+        day (int): the day of the month.
 
-file_version = "1.1.0"
-changes = {"1.0.0": "Initial release", "1.0.1": "Added Version Info."}
+    Returns:
+        (bool) True if the date exists, False otherwise.
+    """
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    if day <= _MONTH_DAYS[month - 1]:
+        return True
+    # only February 29 remains, in a leap year
+    return (
+        month == 2
+        and day == 29
+        and year % 4 == 0
+        and (year % 100 != 0 or year % 400 == 0)
+    )
+
+
+def _is_iso_date(date_input: str) -> bool:
+    """
+    Test for a valid, zero padded, yyyy-mm-dd date.
+
+    Parameters:
+        date_input (str): the date to test.
+
+    Returns:
+        (bool) True if the date is a valid zero padded yyyy-mm-dd date,
+            False otherwise.
+    """
+    # fromisoformat also accepts the basic and week date forms
+    if len(date_input) != 10 or date_input[4] != "-" or date_input[7] != "-":
+        return False
+    try:
+        datetime.date.fromisoformat(date_input)
+    except ValueError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(reg_exp: str) -> re.Pattern:
+    """
+    Compile a caller supplied regular expression once.
+
+    Parameters:
+        reg_exp (str): the regular expression to compile.
+
+    Returns:
+        (re.Pattern) the compiled regular expression.
+    """
+    return re.compile(reg_exp)
 
 
 class Validate:
@@ -25,6 +142,9 @@ class Validate:
     Text fields and arbitrary regular expressions.
     """
 
+    __slots__ = ()
+    """Validate holds no per instance state."""
+
     REQUIRED = True
     """(bool) variable required, must satisfy requirements."""
     OPTIONAL = False
@@ -74,46 +194,48 @@ class Validate:
             "msg": "",
         }  # with no error message
 
-        if not isinstance(value, (int, str)):
-            result["valid"] = False
-            result["msg"] = (
-                "Value must be a valid integer value or string"
-                + " represention of a valid integer value"
-            )
+        if type(value) is int:
+            pass  # the common case, only the range needs checking
 
-        if value == "":
-            if required == self.OPTIONAL:
+        elif isinstance(value, str):
+            if value == "":
+                if required != self.OPTIONAL:
+                    result["valid"] = False
+                    result["msg"] = "An integer entry is required"
+                    return result
                 value = 0
-                result["entry"] = value
             else:
-                result["valid"] = False
-                result["msg"] = "An integer entry is required"
-
-        if isinstance(value, str):
-            # remove any leading or training white space
-            value = value.strip()
-            if re.match(r"^[-+]?([1-9]\d*|0)$", value):
+                # remove any leading or training white space
+                value = value.strip()
+                # optional sign, then digits without a leading zero
+                digits = value[1:] if value[:1] in ("+", "-") else value
+                if not digits.isdecimal() or (
+                    digits[0] not in "123456789" and digits != "0"
+                ):
+                    result["valid"] = False
+                    result["msg"] = "Value does not represent an Integer value"
+                    return result
                 value = int(value)
-                result["entry"] = value
-            else:
-                result["valid"] = False
-                result["msg"] = "Value does not represent an Integer value"
+            result["entry"] = value
 
-        if result["valid"]:
-            if value < min_value:
-                result["valid"] = False
-                result["msg"] = (
-                    "The entry is less than the required"
-                    + " minimum value of "
-                    + str(min_value)
-                )
-            elif value > max_value:
-                result["valid"] = False
-                result["msg"] = (
-                    "The entry is greater than the required"
-                    + " maximum value of "
-                    + str(max_value)
-                )
+        elif not isinstance(value, int):
+            result["valid"] = False
+            result["msg"] = (
+                "Value must be a valid integer value or string"
+                " represention of a valid integer value"
+            )
+            return result
+
+        if value < min_value:
+            result["valid"] = False
+            result["msg"] = (
+                f"The entry is less than the required minimum value of {min_value}"
+            )
+        elif value > max_value:
+            result["valid"] = False
+            result["msg"] = (
+                f"The entry is greater than the required maximum value of {max_value}"
+            )
         return result
 
     def float_field(self, value, required, min_value=-1.0e8, max_value=1.0e8):
@@ -155,46 +277,44 @@ class Validate:
             "msg": "",
         }
 
-        if not isinstance(value, (float, str)):
-            result["valid"] = False
-            result["msg"] = (
-                "Value must be a valid float value or string"
-                + " represention of a valid float value"
-            )
+        if type(value) is float:
+            pass  # the common case, only the range needs checking
 
-        if value == "":
-            if required == self.OPTIONAL:
+        elif isinstance(value, str):
+            if value == "":
+                if required != self.OPTIONAL:
+                    result["valid"] = False
+                    result["msg"] = "An float entry is required"
+                    return result
                 value = float(0)
-                result["entry"] = value
             else:
-                result["valid"] = False
-                result["msg"] = "An float entry is required"
-
-        if isinstance(value, str):
-            # remove any leading or training white space
-            value = value.strip()
-            if re.match(r"^[+-]?\ *(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$", value):
+                # remove any leading or training white space
+                value = value.strip()
+                if not _FLOAT_RE.match(value):
+                    result["valid"] = False
+                    result["msg"] = "Value does not represent a Float value"
+                    return result
                 value = float(value)
-                result["entry"] = value
-            else:
-                result["valid"] = False
-                result["msg"] = "Value does not represent a Float value"
+            result["entry"] = value
 
-        if result["valid"]:
-            if value < min_value:
-                result["valid"] = False
-                result["msg"] = (
-                    "The entry is less than the required"
-                    + " minimum value of "
-                    + str(min_value)
-                )
-            elif value > max_value:
-                result["valid"] = False
-                result["msg"] = (
-                    "The entry is greater than the required"
-                    + " maximum value of "
-                    + str(max_value)
-                )
+        elif not isinstance(value, float):
+            result["valid"] = False
+            result["msg"] = (
+                "Value must be a valid float value or string"
+                " represention of a valid float value"
+            )
+            return result
+
+        if value < min_value:
+            result["valid"] = False
+            result["msg"] = (
+                f"The entry is less than the required minimum value of {min_value}"
+            )
+        elif value > max_value:
+            result["valid"] = False
+            result["msg"] = (
+                f"The entry is greater than the required maximum value of {max_value}"
+            )
         return result
 
     def text_field(
@@ -240,36 +360,33 @@ class Validate:
         if not isinstance(text, str):
             result["valid"] = False
             result["msg"] = "Value must be a valid string of text"
+            return result
 
-        if result["valid"] and required == self.REQUIRED and text == "":
+        if required == self.REQUIRED and text == "":
             # required and empty
             result["valid"] = False
             result["msg"] = (
-                "A text value ("
-                + str(min_length)
-                + " and "
-                + str(max_length)
-                + " characters long) is required and cannot be empty"
+                f"A text value ({min_length} and {max_length} characters long)"
+                " is required and cannot be empty"
             )
+            return result
 
-            # check the length of the entry
-        if result["valid"]:
-            text = text.strip()  # remove leading and trailing whitespace
-            if len(text) < min_length:
-                result["valid"] = False
-                result["msg"] = (
-                    "The entered value is too short ( at least "
-                    + str(min_length)
-                    + " characters required)"
-                )
+        # check the length of the entry
+        # leading and trailing whitespace is not counted
+        length = len(text.strip())
+        if length < min_length:
+            result["valid"] = False
+            result["msg"] = (
+                f"The entered value is too short ( at least {min_length}"
+                " characters required)"
+            )
 
-            elif len(text) > max_length:
-                result["valid"] = False
-                result["msg"] = (
-                    "The entered value is too long (no more than "
-                    + str(max_length)
-                    + " characters allowed)"
-                )
+        elif length > max_length:
+            result["valid"] = False
+            result["msg"] = (
+                f"The entered value is too long (no more than {max_length}"
+                " characters allowed)"
+            )
         return result
 
     def boolean(self, state: Union[str, int, bool]) -> dict[str, Any]:
@@ -301,11 +418,15 @@ class Validate:
             "msg": "",
         }  # with no error message
 
-        if state in (True, "true", "on", "1", 1):
-            result["entry"] = True
-        elif state in (False, "false", "off", "0", 0):
-            result["entry"] = False
-        else:  # error in entry
+        try:
+            if state in _TRUE_STATES:
+                result["entry"] = True
+            elif state in _FALSE_STATES:
+                result["entry"] = False
+            else:  # error in entry
+                result["valid"] = False
+                result["msg"] = "Invalid entry for boolean"
+        except TypeError:  # unhashable entry, cannot be a boolean
             result["valid"] = False
             result["msg"] = "Invalid entry for boolean"
 
@@ -356,40 +477,35 @@ class Validate:
         # The string input is converted to a date object and validated
         # to be a valid date.
         if result["valid"]:
-            # build a datatime object to check things
-            # mm/dd/yyyy; month and day either single or double digits
-            if re.match(r"\d{1,2}/\d{1,2}/\d\d\d\d", date_input):
-                date_array = date_input.split("/")
-                try:
-                    date_stamp = datetime.datetime(
-                        int(date_array[2]), int(date_array[0]), int(date_array[1])
-                    ).timestamp()
-                except ValueError:
-                    result["entry"] = date_input
-                    result["valid"] = False
-                    result["msg"] = (
-                        date_input + " is not a valid date of form 02/23/2014"
-                    )
+            # zero padded yyyy-mm-dd, parsed and checked in one call
+            if _is_iso_date(date_input):
+                return result
 
+            # mm/dd/yyyy; month and day either single or double digits
+            date_parts = _split_date(date_input, "/", _SLASH_DATE_WIDTHS)
+            if date_parts:
+                month, day, year = date_parts
+                date_form = "02/23/2014"
+            else:
                 # yyyy-mm-dd    month and day either single or double digits
-            elif re.match(r"\d\d\d\d-\d{1,2}-\d{1,2}", date_input):
-                date_array = date_input.split("-")
-                try:
-                    date_stamp = datetime.datetime(
-                        int(date_array[0]), int(date_array[1]), int(date_array[2])
-                    ).timestamp()
-                except ValueError:
+                date_parts = _split_date(date_input, "-", _DASH_DATE_WIDTHS)
+                if date_parts:
+                    year, month, day = date_parts
+                    date_form = "2015-23-03"
+
+            if date_parts:
+                if not _is_valid_date(int(year), int(month), int(day)):
                     result["entry"] = date_input
                     result["valid"] = False
                     result["msg"] = (
-                        date_input + " is not a valid date of form 2015-23-03"
+                        f"{date_input} is not a valid date of form {date_form}"
                     )
 
                 # Bad entry
             else:
                 result["entry"] = date_input
                 result["valid"] = False
-                result["msg"] = date_input + " is not recognizable as a valid date"
+                result["msg"] = f"{date_input} is not recognizable as a valid date"
         return result
 
     def reg_exp_field(
@@ -423,10 +539,7 @@ class Validate:
             "msg": "",
         }
 
-        try:
-            pattern = re.compile(reg_exp)
-        finally:
-            pass
+        pattern = _compile_pattern(reg_exp)
 
         if not isinstance(entry_value, str):
             result["valid"] = False
@@ -437,7 +550,55 @@ class Validate:
                 result["valid"] = False
                 result["msg"] = "Value must be supplied"
 
-            if required == self.REQUIRED and not re.match(reg_exp, entry_value):
+            if required == self.REQUIRED and not pattern.match(entry_value):
                 result["valid"] = False
                 result["msg"] = "Value format is incorrect."
         return result
+
+    def reg_exp_validator(
+        self, reg_exp: str, required: bool
+    ) -> Callable[[str], dict[str, Any]]:
+        """
+        Build a validator for one regular expression.
+
+        The returned function gives the same result as reg_exp_field
+        with the given reg_exp and required values. The pattern is
+        compiled and the required choice made once, so a caller
+        checking many entries against the same pattern, such as a
+        table column, avoids that work on every entry.
+
+        Parameters:
+            reg_exp (str): The regular expression to be matched.
+            required (bool): one of the constants Validate.REQUIRED or
+                Validate.OPTIONAL constants
+
+        Returns:
+            (Callable[[str], dict]) function taking the entry_value to
+                be validated and returning the reg_exp_field result.
+        """
+        pattern = _compile_pattern(reg_exp)
+
+        def check_type(entry_value: str) -> dict[str, Any]:
+            if not isinstance(entry_value, str):
+                return {
+                    "entry": entry_value,
+                    "valid": False,
+                    "msg": "The entry value must be a valid string",
+                }
+            return {"entry": entry_value, "valid": True, "msg": ""}
+
+        if required != self.REQUIRED:
+            return check_type
+
+        def check_required(entry_value: str) -> dict[str, Any]:
+            result = check_type(entry_value)
+            if result["valid"]:
+                if not pattern.match(entry_value):
+                    result["valid"] = False
+                    result["msg"] = "Value format is incorrect."
+                elif entry_value == "":
+                    result["valid"] = False
+                    result["msg"] = "Value must be supplied"
+            return result
+
+        return check_required
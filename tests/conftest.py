@@ -0,0 +1,19 @@
+"""
+Shared pytest configuration for the lbk_library tests.
+
+Puts the package source directory on the import path once per session
+so the test modules import the working tree rather than an installed
+copy.
+
+File:       conftest.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022, 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
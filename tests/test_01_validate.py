@@ -7,18 +7,23 @@ Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
+import pytest
 
 from lbk_library import Validate
+from lbk_library.validate import _compile_pattern
+
+
+@pytest.fixture(scope="module")
+def validate():
+    """One Validate instance for the module; it holds no state."""
+    return Validate()
+
+
+def test_01_00_no_instance_dict(validate):
+    assert not hasattr(validate, "__dict__")
 
 
-def test_01_01_integer_field():
-    validate = Validate()
+def test_01_01_integer_field(validate):
     number = 10  # good number
     result = validate.integer_field(number, validate.REQUIRED, 1, 30)
     assert result["valid"]
@@ -35,6 +40,7 @@ def test_01_01_integer_field():
     result = validate.integer_field(number, validate.OPTIONAL, 20, 30)
     assert not result["valid"]
     assert result["entry"] == number
+    assert result["msg"] == "The entry is less than the required minimum value of 20"
 
     result = validate.integer_field(None, validate.REQUIRED)
     assert not result["valid"]
@@ -44,6 +50,16 @@ def test_01_01_integer_field():
     assert result["valid"]
     assert result["entry"] == 0
 
+    assert validate.integer_field(" +5 ", validate.REQUIRED)["entry"] == 5
+    assert validate.integer_field("-0", validate.REQUIRED)["valid"]
+    assert not validate.integer_field("007", validate.REQUIRED)["valid"]
+    assert not validate.integer_field("1_000", validate.REQUIRED)["valid"]
+    assert not validate.integer_field("-", validate.REQUIRED)["valid"]
+
+    result = validate.integer_field("", validate.REQUIRED)
+    assert not result["valid"]
+    assert result["msg"] == "An integer entry is required"
+
     result = validate.integer_field("", validate.REQUIRED)
     assert not result["valid"]
     assert result["entry"] == ""
@@ -62,8 +78,7 @@ def test_01_01_integer_field():
     assert result["entry"] == int(number)
 
 
-def test_01_02_float_field():
-    validate = Validate()
+def test_01_02_float_field(validate):
     number = None
     result = validate.float_field(number, validate.REQUIRED)
     assert not result["valid"]
@@ -99,8 +114,7 @@ def test_01_02_float_field():
     assert result["entry"] == 20.0
 
 
-def test_01_03_text_field():
-    validate = Validate()
+def test_01_03_text_field(validate):
     text = None  # required, 1 <= len(text) <=255
     result = validate.text_field(text, validate.REQUIRED)
     assert not result["valid"]
@@ -124,42 +138,44 @@ def test_01_03_text_field():
     text = "This is text"  # too long, 1 <= len(text) <=10
     result = validate.text_field(text, validate.REQUIRED, 1, 10)
     assert not result["valid"]
+    assert result["msg"] == (
+        "The entered value is too long (no more than 10 characters allowed)"
+    )
 
     text = "This is text"  # too short, 20 <= len(text) <=255
     result = validate.text_field(text, validate.OPTIONAL, 20)
     assert not result["valid"]
 
 
-def test_01_04_boolean():
-    validate = Validate()
-    # ON values
-    assert validate.boolean(True)["valid"]
-    assert validate.boolean(True)["entry"]
-    assert validate.boolean("true")["valid"]
-    assert validate.boolean("true")["entry"]
-    assert validate.boolean("on")["valid"]
-    assert validate.boolean("on")["entry"]
-    assert validate.boolean("1")["valid"]
-    assert validate.boolean("1")["entry"]
-    assert validate.boolean(1)["valid"]
-    assert validate.boolean(1)["entry"]
-    # OFF values
-    assert validate.boolean(False)["valid"]
-    assert not validate.boolean(False)["entry"]
-    assert validate.boolean("false")["valid"]
-    assert not validate.boolean("false")["entry"]
-    assert validate.boolean("off")["valid"]
-    assert not validate.boolean("off")["entry"]
-    assert validate.boolean("0")["valid"]
-    assert not validate.boolean("0")["entry"]
-    assert validate.boolean(0)["valid"]
-    assert not validate.boolean(0)["entry"]
-    # invalid value
-    assert not validate.boolean(2)["valid"]
-
-
-def test_01_05_date_field():
-    validate = Validate()
+@pytest.mark.parametrize(
+    "state, expected",
+    [
+        # ON values
+        (True, True),
+        ("true", True),
+        ("on", True),
+        ("1", True),
+        (1, True),
+        # OFF values
+        (False, False),
+        ("false", False),
+        ("off", False),
+        ("0", False),
+        (0, False),
+    ],
+)
+def test_01_04_boolean(validate, state, expected):
+    result = validate.boolean(state)
+    assert result["valid"]
+    assert result["entry"] == expected
+
+
+@pytest.mark.parametrize("state", [2, "yes", ["true"]])
+def test_01_04a_boolean_invalid(validate, state):
+    assert not validate.boolean(state)["valid"]
+
+
+def test_01_05_date_field(validate):
     # Valid date
     assert validate.date_field("02/28/2020", validate.REQUIRED)["valid"]
     assert validate.date_field("2020-02-28", validate.REQUIRED)["valid"]
@@ -170,10 +186,33 @@ def test_01_05_date_field():
     assert not validate.date_field("02/29/2021", validate.REQUIRED)["valid"]
     assert not validate.date_field("02/20", validate.REQUIRED)["valid"]
     assert not validate.date_field("2021-02-29", validate.REQUIRED)["valid"]
-
-
-def test_01_06_reg_exp_field():
-    validate = Validate()
+    assert validate.date_field("2/3/2003", validate.REQUIRED)["valid"]
+    assert validate.date_field(" 2003-2-3 ", validate.REQUIRED)["valid"]
+    assert not validate.date_field("02/23/2015/1", validate.REQUIRED)["valid"]
+    assert not validate.date_field("02-23/2015", validate.REQUIRED)["valid"]
+    assert not validate.date_field("2/+3/2003", validate.REQUIRED)["valid"]
+    result = validate.date_field("02/29/2021", validate.REQUIRED)
+    assert result["msg"] == "02/29/2021 is not a valid date of form 02/23/2014"
+    # month lengths and leap years
+    assert validate.date_field("2/29/2000", validate.REQUIRED)["valid"]
+    assert not validate.date_field("2/29/1900", validate.REQUIRED)["valid"]
+    assert validate.date_field("2024-2-29", validate.REQUIRED)["valid"]
+    assert not validate.date_field("4/31/2024", validate.REQUIRED)["valid"]
+    assert not validate.date_field("13/1/2024", validate.REQUIRED)["valid"]
+    assert not validate.date_field("1/0/2024", validate.REQUIRED)["valid"]
+    assert not validate.date_field("1/1/0000", validate.REQUIRED)["valid"]
+    # trailing or leading characters are not accepted
+    assert not validate.date_field("02/23/2014extra", validate.REQUIRED)["valid"]
+    assert not validate.date_field("2014-02-23extra", validate.REQUIRED)["valid"]
+    assert not validate.date_field("02/23/20145", validate.REQUIRED)["valid"]
+    assert not validate.date_field("x2014-02-23", validate.REQUIRED)["valid"]
+    assert not validate.date_field("20200228", validate.REQUIRED)["valid"]
+    assert not validate.date_field("2020-W09-5", validate.REQUIRED)["valid"]
+    result = validate.date_field("2021-02-29", validate.REQUIRED)
+    assert result["msg"] == "2021-02-29 is not a valid date of form 2015-23-03"
+
+
+def test_01_06_reg_exp_field(validate):
     reg_exp = r"\d\d-\d\d\d"
     value = "01-123"
     assert validate.reg_exp_field(value, reg_exp, validate.REQUIRED)["valid"]
@@ -181,3 +220,18 @@ def test_01_06_reg_exp_field():
     assert not validate.reg_exp_field(value, reg_exp, validate.REQUIRED)["valid"]
     value = 10
     assert not validate.reg_exp_field(value, reg_exp, validate.REQUIRED)["valid"]
+    # the pattern is compiled once and reused
+    value = "02-345"
+    assert validate.reg_exp_field(value, reg_exp, validate.REQUIRED)["valid"]
+    assert _compile_pattern.cache_info().hits > 0
+
+
+def test_01_07_reg_exp_validator(validate):
+    # a validator gives the same results as reg_exp_field
+    for reg_exp in (r"\d\d-\d\d\d", r"\d*"):
+        for required in (validate.REQUIRED, validate.OPTIONAL):
+            validator = validate.reg_exp_validator(reg_exp, required)
+            for value in ("01-123", "0", "", "abc", 10, None):
+                assert validator(value) == validate.reg_exp_field(
+                    value, reg_exp, required
+                )
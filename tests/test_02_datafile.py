@@ -9,14 +9,8 @@ License:    MIT, see file LICENSE
 
 import os
 import sqlite3
-import sys
 
 import pytest
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
 from test_setup import datafile_definition, datafile_name
 
 from lbk_library import DataFile
@@ -28,6 +22,16 @@ from lbk_library.testing_support.core_setup import (
     filesystem,
 )
 
+# query_from_array queries on the elements table, copied with
+# dict(QUERY, key=value) when a test needs a variant
+INSERT_ELEMENTS = {"type": "insert", "table": "elements"}
+DELETE_ELEMENTS = {"type": "delete", "table": "elements"}
+UPDATE_ELEMENTS = {"type": "update", "table": "elements"}
+SELECT_ELEMENTS = {"type": "select", "table": "elements"}
+SELECT_ELEMENT_COLUMNS = dict(
+    SELECT_ELEMENTS, columns=["record_id", "remarks", "installed"]
+)
+
 
 def base_setup(filesystem):
     datafile_name = directories[2] + "/test_data.data"
@@ -36,6 +40,34 @@ def base_setup(filesystem):
     return (filename, datafile)
 
 
+@pytest.fixture(scope="module")
+def memory_datafile():
+    """
+    An in-memory DataFile shared by the tests that do not close or
+    break the connection.
+    """
+    datafile = DataFile()
+    datafile.sql_connect(":memory:")
+    yield datafile
+    datafile_close(datafile)
+
+
+@pytest.fixture
+def clean_elements(memory_datafile):
+    """
+    The shared in-memory DataFile with an empty 'elements' table whose
+    record ids start again at 1.
+    """
+    memory_datafile.sql_executescript(
+        datafile_definition
+        + [
+            "DELETE FROM elements",
+            "DELETE FROM sqlite_sequence WHERE name = 'elements'",
+        ]
+    )
+    return memory_datafile
+
+
 def test_02_01_datafile_constructor():
     datafile = DataFile()
     assert isinstance(datafile, DataFile)
@@ -45,7 +77,7 @@ def test_02_02_sql_connect_invalid():
     datafile = DataFile()
     # invalid connection because of invalid path
     connection = datafile.sql_connect("./invalid_path/nn.db")
-    assert not connection
+    assert connection is False
 
 
 def test_02_03_sql_connect_valid(filesystem):
@@ -55,112 +87,93 @@ def test_02_03_sql_connect_valid(filesystem):
     datafile_close(datafile)
 
 
-def test_02_04_sql_close(filesystem):
-    filename, datafile = base_setup(filesystem)
+def test_02_04_sql_close():
+    datafile = datafile_open(":memory:")
     assert datafile.sql_is_connected()
     datafile.sql_close()
     assert not datafile.sql_is_connected()
 
 
-def test_02_05_sql_bad_statement(filesystem):
-    filename, datafile = base_setup(filesystem)
+def test_02_05_sql_bad_statement(memory_datafile):
+    datafile = memory_datafile
     with pytest.raises(sqlite3.Error) as exc_info:
         sql = "SELECT * FROM"  # missing table name
         result = datafile.sql_query(sql)
     exc_raised = exc_info.value
     assert exc_info.typename == "OperationalError"
-    datafile_close(datafile)
 
 
-def test_02_06_sql_validate_value_none(filesystem):
-    filename, datafile = base_setup(filesystem)
-    result = datafile.sql_validate_value(None)
-    assert result is None
-    datafile_close(datafile)
-
-
-def test_02_07_sql_validate_value_bool(filesystem):
-    filename, datafile = base_setup(filesystem)
-    result = datafile.sql_validate_value(True)
-    assert isinstance(result, int)
-    assert result == 1
-    result = datafile.sql_validate_value(False)
-    assert isinstance(result, int)
-    assert result == 0
-    datafile_close(datafile)
-
-
-def test_02_08_sql_validate_value_string(filesystem):
-    filename, datafile = base_setup(filesystem)
-    result = datafile.sql_validate_value("a string")
-    assert isinstance(result, str)
-    assert result == "'a string'"
-    datafile_close(datafile)
-
-
-def test_02_09_sql_nextid_none(filesystem):
-    filename, datafile = base_setup(filesystem)
-    result = datafile.sql_nextid(None)
-    assert result == 0
-    datafile_close(datafile)
-
-
-def test_02_10_sql_validate(filesystem):
-    filename, datafile = base_setup(filesystem)
-    assert datafile.sql_validate_value(None) is None
-    assert datafile.sql_validate_value("test") == "'test'"
-    assert datafile.sql_validate_value(10) == 10
-    assert datafile.sql_validate_value(True) == 1
-    assert datafile.sql_validate_value(False) == 0
-    datafile_close(datafile)
-
-
-def test_02_11_sql_fetchrow_none(filesystem):
-    filename, datafile = base_setup(filesystem)
-    result = datafile.sql_fetchrow(None)
-    assert not result
-    datafile_close(datafile)
-
-
-def test_02_12_sql_fetchrowset_none(filesystem):
-    filename, datafile = base_setup(filesystem)
-    result = datafile.sql_fetchrowset(None)
-    assert len(result) == 0
-    datafile_close(datafile)
-
-
-def test_02_13_sql_query_from_array_none(filesystem):
-    filename, datafile = base_setup(filesystem)
-    assert datafile
-    result = datafile.sql_query_from_array(None)
-    assert result == ""
-    datafile_close(datafile)
-
-
-def test_02_14_sql_query_from_array_bad_query(filesystem):
-    filename, datafile = base_setup(filesystem)
-    query = list()
-    result = datafile.sql_query_from_array(query)
-    assert not result
-    datafile_close(datafile)
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        (True, 1),
+        (False, 0),
+        ("a string", "'a string'"),
+        ("test", "'test'"),
+        (10, 10),
+    ],
+)
+def test_02_06_sql_validate_value(value, expected):
+    # sql_validate_value does not use the connection
+    result = DataFile().sql_validate_value(value)
+    assert result == expected
+    assert type(result) is type(expected)
 
 
-def test_02_15_sql_query_from_array_bad_type(filesystem):
-    filename, datafile = base_setup(filesystem)
-    query = {"type": "GiveMe"}
-    assert not datafile.sql_query_from_array(query)
-    datafile_close(datafile)
+@pytest.mark.parametrize(
+    "method, expected",
+    [("sql_nextid", 0), ("sql_fetchrow", {}), ("sql_fetchrowset", [])],
+)
+def test_02_09_no_query_result(method, expected):
+    # without a query result, nothing is read from the connection
+    result = getattr(DataFile(), method)(None)
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "query, value_set",
+    [
+        (None, {}),
+        (list(), {}),
+        ({"type": "GiveMe"}, {}),
+        (INSERT_ELEMENTS, None),
+        (INSERT_ELEMENTS, {}),
+    ],
+)
+def test_02_13_sql_query_from_array_invalid(query, value_set):
+    assert DataFile().sql_query_from_array(query, value_set) == ""
+
+
+def test_02_15a_sql_query_from_array_repeated(memory_datafile):
+    datafile = memory_datafile
+    value_set = {"remarks": "a remark", "installed": True}
+    query = dict(SELECT_ELEMENT_COLUMNS, limit=["1", "1"])
+    expected = "SELECT record_id, remarks, installed FROM elements  LIMIT 1 OFFSET 1"
+    # a repeated query builds the same statement
+    for count in range(2):
+        assert datafile.sql_query_from_array(query) == expected
+        assert datafile.sql_query_from_array(INSERT_ELEMENTS, value_set) == (
+            "INSERT INTO elements (remarks, installed) VALUES (:remarks, :installed)"
+        )
+    # the statement follows the value_set key order
+    value_set = {"installed": True, "remarks": "a remark"}
+    assert datafile.sql_query_from_array(INSERT_ELEMENTS, value_set) == (
+        "INSERT INTO elements (installed, remarks) VALUES (:installed, :remarks)"
+    )
+    # an unhashable query entry is still built
+    query["extra"] = {}
+    assert datafile.sql_query_from_array(query) == expected
 
 
-def test_02_16_sql_query_from_array_delete(filesystem):
-    filename, datafile = base_setup(filesystem)
+def test_02_16_sql_query_from_array_delete(clean_elements):
+    datafile = clean_elements
     value_set = {
         "record_id": None,
         "installed": False,
         "remarks": "another iffy remark",
     }
-    query = {"type": "insert", "table": "elements"}
-    sql_insert = datafile.sql_query_from_array(query, value_set)
+    sql_insert = datafile.sql_query_from_array(INSERT_ELEMENTS, value_set)
     assert (
         sql_insert
         == "INSERT INTO elements (record_id, installed, remarks) VALUES (:record_id, :installed, :remarks)"
@@ -171,8 +184,7 @@ def test_02_16_sql_query_from_array_delete(filesystem):
     assert index == 1
 
     # good delete
-    query = {"type": "delete", "table": "elements"}
-    query["where"] = "record_id = " + str(index)
+    query = dict(DELETE_ELEMENTS, where=f"record_id = {index}")
     sql_delete = datafile.sql_query_from_array(query)
     assert sql_delete == "DELETE FROM elements WHERE record_id = 1"
     result = datafile.sql_query(sql_delete)
@@ -180,132 +192,198 @@ def test_02_16_sql_query_from_array_delete(filesystem):
 
     # bad delete, missing where clause
     with pytest.raises(sqlite3.Error) as exc_info:
-        query = {"type": "delete", "table": "elements"}
-        sql = datafile.sql_query_from_array(query)
+        sql = datafile.sql_query_from_array(DELETE_ELEMENTS)
         result = datafile.sql_query(sql)
     exc_raised = exc_info.value
     assert exc_info.typename == "OperationalError"
-    datafile_close(datafile)
 
 
-def test_02_17_sql_query_from_array_update(filesystem):
-    filename, datafile = base_setup(filesystem)
+def test_02_17_sql_query_from_array_update(clean_elements):
+    datafile = clean_elements
     value_set = {
         "record_id": None,
         "installed": False,
         "remarks": "another iffy remark",
     }
-    query = {"type": "insert", "table": "elements"}
-    sql = datafile.sql_query_from_array(query, value_set)
+    sql = datafile.sql_query_from_array(INSERT_ELEMENTS, value_set)
     result = datafile.sql_query(sql, value_set)
     assert result
 
     index = datafile.sql_nextid(result)
     value_set["installed"] = True
-    query = {"type": "update", "table": "elements"}
-    query["where"] = "record_id = " + str(index)
+    query = dict(UPDATE_ELEMENTS, where=f"record_id = {index}")
     sql = datafile.sql_query_from_array(query, value_set)
     result = datafile.sql_query(sql, value_set)
     assert result
-    datafile_close(datafile)
 
 
-def test_02_18_sql_query_from_array_select(filesystem):
-    filename, datafile = base_setup(filesystem)
+def test_02_18_sql_query_from_array_select(clean_elements):
+    datafile = clean_elements
     value_set = {
         "record_id": None,
         "installed": False,
         "remarks": "another iffy remark",
     }
-    query_insert = {"type": "insert", "table": "elements"}
-    sql = datafile.sql_query_from_array(query_insert, value_set)
-    result = datafile.sql_query(sql, value_set)
 
-    query_select = {"type": "select", "table": "elements", "columns": "*"}
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql, value_set)
-    assert result
-    new_row = datafile.sql_fetchrow(result)
-    assert new_row["record_id"] == 1
-    assert new_row["remarks"] == value_set["remarks"]
-    assert new_row["installed"] == value_set["installed"]
-    query_select = {"type": "select", "table": "elements", "keys": "[*]"}
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql, value_set)
-    assert result
-    new_rows = datafile.sql_fetchrowset(result)
-    assert len(new_rows) == 1
+    def select_rows(query_select, expected_len):
+        sql = datafile.sql_query_from_array(query_select)
+        result = datafile.sql_query(sql, value_set)
+        assert result
+        rows = datafile.sql_fetchrowset(result)
+        assert len(rows) == expected_len
+        return rows
 
-    query_select = {
-        "type": "select",
-        "table": "elements",
-        "columns": ["record_id", "remarks", "installed"],
-    }
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql)
-    assert result
+    datafile.sql_query(
+        datafile.sql_query_from_array(INSERT_ELEMENTS, value_set), value_set
+    )
 
-    new_row = datafile.sql_fetchrow(result)
+    new_row = select_rows(dict(SELECT_ELEMENTS, columns="*"), 1)[0]
     assert new_row["record_id"] == 1
     assert new_row["remarks"] == value_set["remarks"]
     assert new_row["installed"] == value_set["installed"]
-    assert len(new_row) == 3
-
-    sql = datafile.sql_query_from_array(query_insert, value_set)
-    result = datafile.sql_query(sql, value_set)
-    assert result
-    sql = datafile.sql_query_from_array(query_select, value_set)
-    result = datafile.sql_query(sql, value_set)
-    assert result
-    new_rows = datafile.sql_fetchrowset(result)
-    assert len(new_rows) == 2
-
-    query_select = {
-        "type": "select",
-        "table": "elements",
-        "columns": ["record_id", "remarks", "installed"],
-        "order_by": "record_id DESC",
+    select_rows(dict(SELECT_ELEMENTS, keys="[*]"), 1)
+    new_row = select_rows(SELECT_ELEMENT_COLUMNS, 1)[0]
+    assert new_row == {
+        "record_id": 1,
+        "installed": value_set["installed"],
+        "remarks": value_set["remarks"],
     }
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql, value_set)
-    assert result
-    new_rows = datafile.sql_fetchrowset(result)
-    assert len(new_rows) == 2
+
+    sql = datafile.sql_query_from_array(INSERT_ELEMENTS, value_set)
+    assert datafile.sql_query(sql, value_set)
+    select_rows(SELECT_ELEMENT_COLUMNS, 2)
+
+    new_rows = select_rows(dict(SELECT_ELEMENT_COLUMNS, order_by="record_id DESC"), 2)
     assert new_rows[1]["record_id"] < new_rows[0]["record_id"]
+    for limit, record_id in ((["1"], 1), (["1", "1"], 2)):
+        new_rows = select_rows(dict(SELECT_ELEMENT_COLUMNS, limit=limit), 1)
+        assert new_rows[0]["record_id"] == record_id
+    new_rows = select_rows(dict(SELECT_ELEMENTS, where="record_id = 2"), 1)
+    assert new_rows[0]["record_id"] == 2
 
-    query_select = {
-        "type": "select",
-        "table": "elements",
-        "columns": ["record_id", "remarks", "installed"],
-        "limit": ["1"],
-    }
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql, value_set)
-    assert result
-    new_rows = datafile.sql_fetchrowset(result)
-    assert len(new_rows) == 1
-    assert new_rows[0]["record_id"] == 1
-
-    query_select = {
-        "type": "select",
-        "table": "elements",
-        "columns": ["record_id", "remarks", "installed"],
-        "limit": ["1", "1"],
+
+def test_02_18_1_sql_insert(clean_elements):
+    datafile = clean_elements
+    for remarks in ("first", "second"):
+        result = datafile.sql_insert("elements", {"remarks": remarks})
+        assert isinstance(result, sqlite3.Cursor)
+    assert datafile.sql_nextid(result) == 2
+    result = datafile.sql_insert("elements", {"installed": True, "remarks": "third"})
+    result = datafile.sql_query("SELECT * FROM elements WHERE record_id = 3")
+    assert datafile.sql_fetchrow(result) == {
+        "record_id": 3,
+        "installed": 1,
+        "remarks": "third",
     }
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql, value_set)
+
+    with pytest.raises(sqlite3.OperationalError):
+        datafile.sql_insert("no_table", {"remarks": "fourth"})
+
+
+def test_02_18a_sql_executemany(filesystem):
+    filename, datafile = base_setup(filesystem)
+    sql = "INSERT INTO elements (remarks, installed) VALUES (:remarks, :installed)"
+    value_sets = [
+        {"remarks": "first", "installed": True},
+        {"remarks": "second", "installed": False},
+        {"remarks": "third", "installed": True},
+    ]
+    result = datafile.sql_executemany(sql, value_sets)
     assert result
-    new_rows = datafile.sql_fetchrowset(result)
-    assert len(new_rows) == 1
-    assert new_rows[0]["record_id"] == 2
+    assert result.rowcount == len(value_sets)
+
+    result = datafile.sql_query("SELECT remarks FROM elements ORDER BY record_id")
+    rows = datafile.sql_fetchrowset(result)
+    assert [row["remarks"] for row in rows] == ["first", "second", "third"]
+
+    with pytest.raises(sqlite3.OperationalError):
+        datafile.sql_executemany("INSERT INTO no_table VALUES (:a)", [{"a": 1}])
 
-    query_select = {"type": "select", "table": "elements", "where": "record_id = 2"}
-    sql = datafile.sql_query_from_array(query_select)
-    result = datafile.sql_query(sql)
+    # not connected
+    datafile_close(datafile)
+    assert datafile.sql_executemany(sql, value_sets) is None
+
+
+def test_02_18b_sql_executescript(filesystem):
+    filename, datafile = base_setup(filesystem)
+    result = datafile.sql_executescript(
+        [
+            "CREATE TABLE first (name TEXT);",
+            "INSERT INTO first (name) VALUES ('one')",
+            "INSERT INTO elements (remarks) VALUES ('two')",
+        ]
+    )
     assert result
-    new_row = datafile.sql_fetchrow(result)
-    assert new_row["record_id"] == 2
+    result = datafile.sql_query("SELECT name FROM first")
+    assert datafile.sql_fetchrowset(result) == [{"name": "one"}]
+
+    # a failing statement rolls back the whole script
+    with pytest.raises(sqlite3.OperationalError):
+        datafile.sql_executescript(
+            [
+                "INSERT INTO first (name) VALUES ('three')",
+                "INSERT INTO no_table (name) VALUES ('four')",
+            ]
+        )
+    result = datafile.sql_query("SELECT name FROM first")
+    assert datafile.sql_fetchrowset(result) == [{"name": "one"}]
+
+    # a trailing comment does not swallow the next statement
+    datafile.sql_executescript(
+        [
+            "INSERT INTO first (name) VALUES ('five') -- the fifth name",
+            "INSERT INTO first (name) VALUES ('six')",
+        ]
+    )
+    result = datafile.sql_query("SELECT name FROM first")
+    assert datafile.sql_fetchrowset(result) == [
+        {"name": "one"},
+        {"name": "five"},
+        {"name": "six"},
+    ]
+
+    # inside a transaction block the statements roll back with the block
+    with pytest.raises(ValueError):
+        with datafile.transaction():
+            datafile.sql_executescript(["INSERT INTO first (name) VALUES ('seven')"])
+            raise ValueError("abandon the block")
+    result = datafile.sql_query("SELECT COUNT(*) AS count FROM first")
+    assert datafile.sql_fetchrow(result)["count"] == 3
+
+    # not connected
     datafile_close(datafile)
+    assert datafile.sql_executescript(["SELECT 1"]) is None
+
+
+def test_02_18c_transaction(clean_elements):
+    datafile = clean_elements
+    sql = datafile.sql_query_from_array(INSERT_ELEMENTS, {"remarks": None})
+    count_sql = "SELECT COUNT(*) AS count FROM elements"
+
+    # the block's inserts are committed together
+    with datafile.transaction() as block_datafile:
+        assert block_datafile is datafile
+        datafile.sql_query(sql, {"remarks": "first"})
+        with datafile.transaction():  # nested blocks do not commit
+            datafile.sql_query(sql, {"remarks": "second"})
+        assert datafile._DataFile__connection.in_transaction
+    assert not datafile._DataFile__connection.in_transaction
+    result = datafile.sql_query(count_sql)
+    assert datafile.sql_fetchrow(result)["count"] == 2
+
+    # an exception rolls the whole block back
+    with pytest.raises(ValueError):
+        with datafile.transaction():
+            datafile.sql_query(sql, {"remarks": "third"})
+            with datafile.transaction():
+                datafile.sql_query(sql, {"remarks": "fourth"})
+            raise ValueError("abandon the block")
+    result = datafile.sql_query(count_sql)
+    assert datafile.sql_fetchrow(result)["count"] == 2
+
+    # statements outside a block still commit at once
+    datafile.sql_query(sql, {"remarks": "fifth"})
+    assert not datafile._DataFile__connection.in_transaction
 
 
 def test_02_19_new_db_file(tmpdir):
@@ -327,8 +405,36 @@ def test_02_19_new_db_file(tmpdir):
 
     query = "PRAGMA table_info('elements');"
     result = datafile.sql_query(query)
-    column_names = datafile.sql_fetchrowset(result)
-    print(column_names)
-    expected_names = ["record_id", "remarks", "installed"]
-    for col in column_names:
-        assert col["name"] in expected_names
+    column_names = {col["name"] for col in datafile.sql_fetchrowset(result)}
+    assert column_names == {"record_id", "remarks", "installed"}
+
+
+def test_02_19a_new_db_file_pragma(tmpdir):
+    # the journal mode cannot change inside a transaction, so the
+    # PRAGMA runs first even after a comment and later in the list
+    path = tmpdir.join("pragma.db")
+    datafile = DataFile.new_file(
+        path,
+        [
+            "CREATE TABLE t (a INTEGER)",
+            "-- readers do not block the writer\n/* WAL */ PRAGMA journal_mode = WAL",
+        ],
+    )
+    result = datafile.sql_query("PRAGMA journal_mode")
+    assert datafile.sql_fetchrow(result) == {"journal_mode": "wal"}
+    result = datafile.sql_query("SELECT name FROM sqlite_schema WHERE type = 'table'")
+    assert datafile.sql_fetchrowset(result) == [{"name": "t"}]
+    datafile_close(datafile)
+
+
+def test_02_19b_new_db_file_comment(tmpdir):
+    # a trailing comment does not swallow the next statement
+    path = tmpdir.join("comment.db")
+    datafile = DataFile.new_file(
+        path, ["CREATE TABLE t (a INTEGER) -- the t table", "CREATE TABLE u (b TEXT)"]
+    )
+    result = datafile.sql_query(
+        "SELECT name FROM sqlite_schema WHERE type = 'table' ORDER BY name"
+    )
+    assert datafile.sql_fetchrowset(result) == [{"name": "t"}, {"name": "u"}]
+    datafile_close(datafile)
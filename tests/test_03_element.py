@@ -7,60 +7,67 @@ Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
 import pytest
-from test_setup import datafile_name, element_definition, element_values
+from test_setup import element_definition, element_values
 
 from lbk_library import DataFile, Element, Validate
-from lbk_library.testing_support.core_setup import (
-    datafile_close,
-    datafile_create,
-    datafile_open,
-    directories,
-    filesystem,
-)
-
-
-def base_setup(filesystem):
-    filename = filesystem + "/" + datafile_name
-    datafile = datafile_create(filename, element_definition)
-    element = Element(datafile, None)
-    return (element, datafile)
+from lbk_library.testing_support.core_setup import datafile_close, datafile_open
 
+# the built-in Element defaults; Element only reads or copies them
+ELEMENT_DEFAULTS = {"record_id": 0, "remarks": ""}
 
-def test_03_01_element_constr(filesystem):
-    element, datafile = base_setup(filesystem)
-    assert isinstance(element, Element)
+
+@pytest.fixture(scope="module")
+def datafile():
+    """
+    An in-memory DataFile with the 'elements' table, shared by the tests
+    in this module.
+    """
+    datafile = datafile_open(":memory:")
+    datafile.sql_executescript(element_definition)
+    yield datafile
     datafile_close(datafile)
 
 
-def test_03_02_element_get_datafile(filesystem):
-    element, datafile = base_setup(filesystem)
+@pytest.fixture
+def empty_datafile(datafile):
+    """
+    The shared DataFile with an empty 'elements' table whose record ids
+    start again at 1, for the tests that write to it.
+    """
+    datafile.sql_executescript(
+        [
+            "DELETE FROM elements",
+            "DELETE FROM sqlite_sequence WHERE name = 'elements'",
+        ]
+    )
+    return datafile
+
+
+def test_03_01_element_constr(datafile):
+    element = Element(datafile, None)
+    assert isinstance(element, Element)
+
+
+def test_03_02_element_get_datafile(datafile):
+    element = Element(datafile, None)
     assert element.get_datafile() == datafile
-    datafile_close(datafile)
 
 
-def test_03_03_element_get_table(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_03_element_get_table(datafile):
     element = Element(datafile, "elements")
     assert element.get_table() == "elements"
-    datafile_close(datafile)
 
 
-def test_03_04_element_get_validate(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_04_element_get_validate(datafile):
+    element = Element(datafile, None)
     assert isinstance(element.validate, Validate)
-    datafile_close(datafile)
+    # each element has its own validator
+    assert element.validate is not Element(datafile, None).validate
 
 
-def test_03_05_element_get_set_initial_values(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_05_element_get_set_initial_values(datafile):
+    element = Element(datafile, None)
     initial_values = element.get_initial_values()  # start with default values
     assert isinstance(initial_values, dict)
     assert len(initial_values) == len(element._defaults)
@@ -68,32 +75,23 @@ def test_03_05_element_get_set_initial_values(filesystem):
     initial_values = element.get_initial_values()
     assert isinstance(initial_values, dict)
     assert len(initial_values) == len(element_values)
-    for key in element_values:
-        assert initial_values[key] == element_values[key]
-    try:
+    assert initial_values == element_values
+    with pytest.raises(TypeError):
         element.set_initial_values(10)
-    except Exception as excp:
-        assert isinstance(excp, TypeError)
-    datafile_close(datafile)
 
 
-def test_03_06_element_set_default_values_constructor(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_06_element_set_default_values_constructor(datafile):
     element = Element(datafile, "elements", element_values)
     initial_values = element.get_initial_values()
     assert isinstance(initial_values, dict)
     assert len(initial_values) == len(element_values)
-    for key in element_values:
-        assert initial_values[key] == element_values[key]
-    try:
+    assert initial_values == element_values
+    with pytest.raises(TypeError):
         element.set_initial_values(10)
-    except Exception as excp:
-        assert isinstance(excp, TypeError)
-    datafile_close(datafile)
 
 
-def test_03_07_value_changed_flags(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_07_value_changed_flags(datafile):
+    element = Element(datafile, None)
     element.set_initial_values(element_values)
     assert not element.have_values_changed()
     element.set_value_changed_flag("record_id", element_values["record_id"])
@@ -102,27 +100,24 @@ def test_03_07_value_changed_flags(filesystem):
     assert element.have_values_changed()
     element.clear_value_changed_flags()
     assert not element.have_values_changed()
-    datafile_close(datafile)
 
 
-def test_03_08_get_set_properties_valid_flags(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_08_get_set_properties_valid_flags(datafile):
+    element = Element(datafile, None)
     assert not element.set_value_valid_flag("record_id", False)
     assert not element.get_value_valid_flag("record_id")
     assert element.set_value_valid_flag("remarks", True)
     assert element.get_value_valid_flag("remarks")
-    datafile_close(datafile)
 
 
-def test_03_09_element_get_properties(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_09_element_get_properties(datafile):
+    element = Element(datafile, None)
     assert isinstance(element.get_properties(), dict)
-    assert len(element.get_properties()) == 0
-    datafile_close(datafile)
+    assert element.get_properties() == {}
 
 
-def test_03_10_get_set_indiv_properties(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_10_get_set_indiv_properties(datafile):
+    element = Element(datafile, None)
     with pytest.raises(KeyError) as exc_info:
         # Fails because no property values set yet.
         value = element._get_property("record_id")
@@ -138,11 +133,10 @@ def test_03_10_get_set_indiv_properties(filesystem):
     assert element._get_property("remarks") == "remark 1"
     assert element.get_properties()["record_id"] == 10
     assert element.get_properties()["remarks"] == "remark 1"
-    datafile_close(datafile)
 
 
-def test_03_11_is_element_valid(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_11_is_element_valid(datafile):
+    element = Element(datafile, None)
     assert not element.is_element_valid()  # should be false because nothing is set
     element._set_property("record_id", 10)
     # bad key
@@ -161,12 +155,10 @@ def test_03_11_is_element_valid(filesystem):
         value = element.is_element_valid()
     exc_raised = exc_info.value
     assert exc_info.typename == "KeyError"
-    datafile_close(datafile)
 
 
-def test_03_12_update_property_flags(filesystem):
-    element, datafile = base_setup(filesystem)
-    element = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
+def test_03_12_update_property_flags(datafile):
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
     element._set_property("record_id", 1)
     element._set_property("remarks", "")
     element.update_property_flags("record_id", 1, True)
@@ -187,11 +179,10 @@ def test_03_12_update_property_flags(filesystem):
         value = element.get_value_changed_flag("bad_key")
     exc_raised = exc_info.value
     assert exc_info.typename == "KeyError"
-    datafile_close(datafile)
 
 
-def test_03_13_named_get_value(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_13_named_get_value(datafile):
+    element = Element(datafile, None)
     with pytest.raises(KeyError) as exc_info:
         # not assigned so should raise KeyError
         value = element.get_record_id()
@@ -212,12 +203,10 @@ def test_03_13_named_get_value(filesystem):
     assert element.get_record_id() == 10
     element._set_property("remarks", "remark 1")
     assert element.get_remarks() == "remark 1"
-    datafile_close(datafile)
 
 
-def test_03_14_set_functions(filesystem):
-    element, datafile = base_setup(filesystem)
-    element = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
+def test_03_14_set_functions(datafile):
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
     # set element properties from 'element_values'
     #'record_id': 9876, required
     result = element.set_record_id(None)
@@ -240,62 +229,59 @@ def test_03_14_set_functions(filesystem):
     # remarks: fail for non-text parameter
     result = element.set_remarks(100)
     assert not result["valid"]
-    datafile_close(datafile)
 
 
-def test_03_15_element_set_properties(filesystem):
-    element, datafile = base_setup(filesystem)
-    element = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
+def test_03_15_element_set_properties(datafile):
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
     set_results = element.set_properties(element_values)
     assert len(element.get_properties()) == 2
     assert element.get_record_id() == element_values["record_id"]
     assert element.get_remarks() == element_values["remarks"]
     assert len(set_results) == 2
-    assert set_results["record_id"]["entry"] == element_values["record_id"]
-    assert set_results["record_id"]["valid"] == True
-    assert set_results["record_id"]["msg"] == ""
-    datafile_close(datafile)
+    assert set_results["record_id"] == {
+        "entry": element_values["record_id"],
+        "valid": True,
+        "msg": "",
+    }
 
 
-def test_03_16_element_add(filesystem):
-    element, datafile = base_setup(filesystem)
-    element = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
-    element.set_initial_values({"record_id": 0, "remarks": ""})
+def test_03_16_element_add(empty_datafile):
+    datafile = empty_datafile
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
+    element.set_initial_values(ELEMENT_DEFAULTS)
     element.set_properties(element_values)
     element_id = element.add()
     assert element_id == 1
     assert element_id == element.get_record_id()
     assert element_values["remarks"] == element.get_remarks()
-    datafile_close(datafile)
 
 
-def test_03_17_element_read_db(filesystem):
-    element, datafile = base_setup(filesystem)
-    element = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
+def test_03_17_element_read_db(empty_datafile):
+    datafile = empty_datafile
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
     element.set_properties(element_values)
     element_id = element.add()
     assert element_id == 1
     # read db for existing element
-    element2 = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
-    element2.get_properties_from_datafile("record_id", 1)
-    assert element2.get_properties() is not None
-    assert element2.get_record_id() == 1
-    assert element_values["remarks"] == element2.get_remarks()
+    element.reset()
+    element.get_properties_from_datafile("record_id", 1)
+    assert element.get_properties() is not None
+    assert element.get_record_id() == 1
+    assert element_values["remarks"] == element.get_remarks()
     # read db for non-existing element
-    element3 = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
-    element3.get_properties_from_datafile("record_id", 5)
-    assert isinstance(element3.get_properties(), dict)
-    assert len(element3.get_properties()) == 0
+    element.reset()
+    element.get_properties_from_datafile("record_id", 5)
+    assert isinstance(element.get_properties(), dict)
+    assert element.get_properties() == {}
     # Try direct read thru Element
-    element2.set_properties(element2.get_properties_from_datafile(None, None))
-    assert not element2.get_properties()
-    datafile_close(datafile)
+    element.set_properties(element.get_properties_from_datafile(None, None))
+    assert not element.get_properties()
 
 
-def test_03_18_element_update(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_18_element_update(empty_datafile):
+    datafile = empty_datafile
     element = Element(datafile, "elements")
-    element.set_initial_values({"record_id": 0, "remarks": ""})
+    element.set_initial_values(ELEMENT_DEFAULTS)
     element.set_properties(element_values)
     element_id = element.add()
     assert element_id == 1
@@ -308,12 +294,11 @@ def test_03_18_element_update(filesystem):
     assert element.get_properties() is not None
     assert element.get_record_id() == 1
     assert remarks == element.get_remarks()
-    datafile_close(datafile)
 
 
-def test_03_19_element_delete(filesystem):
-    element, datafile = base_setup(filesystem)
-    element = Element(datafile, "elements", {"record_id": 0, "remarks": ""})
+def test_03_19_element_delete(empty_datafile):
+    datafile = empty_datafile
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
     element.set_properties(element_values)
     element_id = element.add()
     assert element_id == 1
@@ -322,14 +307,30 @@ def test_03_19_element_delete(filesystem):
     result = element.delete()
     assert result
     # make sure it is really gone
-    element2 = Element(datafile, "elements")
-    element2.get_properties_from_datafile("record_id", 1)
-    assert len(element2.get_properties()) == 0
-    datafile_close(datafile)
+    element.reset()
+    element.get_properties_from_datafile("record_id", 1)
+    assert element.get_properties() == {}
+
+
+def test_03_19a_element_reset(datafile):
+    element = Element(datafile, "elements", ELEMENT_DEFAULTS)
+    element.set_properties(element_values)
+    element.set_value_changed_flag("remarks", True)
+    element.set_value_valid_flag("remarks", True)
+    element.reset()
+    assert element.get_properties() == {}
+    assert not element.have_values_changed()
+    with pytest.raises(KeyError):
+        element.get_value_valid_flag("remarks")
+    assert element.get_initial_values() == ELEMENT_DEFAULTS
+    assert element.get_datafile() is datafile
+    assert element.get_table() == "elements"
+    new_defaults = {"record_id": 0, "remarks": "new"}
+    element.reset(new_defaults)
+    assert element.get_initial_values() == new_defaults
 
 
-def test_03_20_set_validated_property(filesystem):
-    element, datafile = base_setup(filesystem)
+def test_03_20_set_validated_property(datafile):
     element = Element(datafile, "elements")
     element.set_validated_property("test", True, "is_valid", "not_valid")
     assert element._get_property("test") == "is_valid"
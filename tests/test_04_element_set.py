@@ -7,29 +7,44 @@ Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
-from test_setup import datafile_name, element_definition, new_element
+import pytest
+from test_setup import element_definition, new_element
 
 from lbk_library import DataFile, Element, ElementSet
 from lbk_library.testing_support.core_setup import (
     datafile_close,
-    datafile_create,
-    directories,
-    filesystem,
+    datafile_open,
+    load_datafile_table,
 )
 
+# the seeded rows get record ids 1 to 5 with remarks "Remark # 5" to
+# "Remark # 1"
+NUMBER_ELEMENTS = 5
+
+
+@pytest.fixture(scope="module")
+def datafile():
+    """
+    An in-memory DataFile with the 'elements' table holding the seeded
+    rows, shared by the tests in this module. ElementSet changes only
+    its own list of elements, so the rows stay as seeded.
+    """
+    datafile = datafile_open(":memory:")
+    datafile.sql_executescript(element_definition)
+    load_datafile_table(
+        datafile,
+        "elements",
+        ["remarks"],
+        [["Remark # " + str(NUMBER_ELEMENTS - i)] for i in range(NUMBER_ELEMENTS)],
+    )
+    yield datafile
+    datafile_close(datafile)
+
 
-def base_setup(filesystem):
-    filename = filesystem + "/" + datafile_name
-    datafile = datafile_create(filename, element_definition)
-    element_set = ElementSet(datafile, "elements", Element)
-    return (filename, datafile, element_set)
+@pytest.fixture
+def element_set(datafile):
+    """A new ElementSet holding all the rows of the 'elements' table."""
+    return ElementSet(datafile, "elements", Element)
 
 
 def test_04_01_ElementSet_constr():
@@ -39,43 +54,27 @@ def test_04_01_ElementSet_constr():
     datafile_close(datafile)
 
 
-def test_04_02_ElementSet_get_datafile(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
+def test_04_02_ElementSet_get_datafile(datafile, element_set):
     assert element_set.get_datafile() == datafile
-    datafile_close(datafile)
 
 
-def test_04_03_ElementSet_get_table(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
+def test_04_03_ElementSet_get_table(element_set):
     assert element_set.get_table() == "elements"
-    datafile_close(datafile)
 
 
-def test_04_04_ElementSet_set_table(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
+def test_04_04_ElementSet_set_table(element_set):
     element_set.set_table("parts")
     assert element_set.get_table() == "parts"
-    datafile_close(datafile)
 
 
-def test_04_05_ElementSet_get_properties_type(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
+def test_04_05_ElementSet_get_properties_type(element_set):
     element_set.set_property_set(None)
     prop_set = element_set.get_property_set()
     assert isinstance(prop_set, list)
     assert len(prop_set) == 0
-    datafile_close(datafile)
 
 
-def test_04_06_ElementSet_constructor(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    remark = "Remark # "
-    element_values = {"record_id": None, "remarks": remark}
-    for i in range(5):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element = new_element(datafile, element_values)
-        element_id = element.add()
-
+def test_04_06_ElementSet_constructor(datafile):
     element_set = ElementSet(datafile, "elements", Element)
     properties = element_set.get_property_set()
     assert len(properties) == 5
@@ -109,18 +108,9 @@ def test_04_06_ElementSet_constructor(filesystem):
     properties = element_set.get_property_set()
     assert element_set.get_number_elements() == 3
     assert properties[0].get_record_id() == 2
-    datafile_close(datafile)
 
 
-def test_04_07_insert_element(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    remark = "Remark # "
-    element_values = {"record_id": 1, "remarks": remark}
-    for i in range(5):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element = new_element(datafile, element_values)
-        element_id = element.add()
-    element_set = ElementSet(datafile, "elements", Element)
+def test_04_07_insert_element(datafile, element_set):
     length = element_set.get_number_elements()
     assert length == len(element_set.get_property_set())
     new_values = {"record_id": 0, "remarks": "Remark # 6"}
@@ -128,18 +118,9 @@ def test_04_07_insert_element(filesystem):
     element_set.insert(length, element)
     assert length + 1 == len(element_set.get_property_set())
     assert element_set.get_property_set()[length].get_remarks() == "Remark # 6"
-    datafile_close(datafile)
 
 
-def test_04_08_append_element(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    remark = "Remark # "
-    element_values = {"record_id": None, "remarks": remark}
-    for i in range(5):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element = new_element(datafile, element_values)
-        element_id = element.add()
-    element_set = ElementSet(datafile, "elements", Element)
+def test_04_08_append_element(datafile, element_set):
     length = element_set.get_number_elements()
     assert length == len(element_set.get_property_set())
     new_values = {"record_id": None, "remarks": "Remark # 6"}
@@ -147,57 +128,29 @@ def test_04_08_append_element(filesystem):
     element_set.append(element)
     assert length + 1 == len(element_set.get_property_set())
     assert element_set.get_property_set()[length].get_remarks() == "Remark # 6"
-    datafile_close(datafile)
 
 
-def test_04_09_get_element(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    remark = "Remark # "
-    element_values = {"record_id": 1, "remarks": remark}
-    for i in range(5):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element = new_element(datafile, element_values)
-        element_id = element.add()
-    element_set = ElementSet(datafile, "elements", Element)
+def test_04_09_get_element(element_set):
     length = element_set.get_number_elements()
     assert length == len(element_set.get_property_set())
     third_element_index = 2
     third_element = element_set.get(third_element_index)
     assert third_element.get_record_id() == 3
-    datafile_close(datafile)
 
 
-def test_04_10_delete_element(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    length = 5
-    remark = "Remark # "
-    element_values = {"record_id": 1, "remarks": remark}
-    for i in range(length):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element = new_element(datafile, element_values)
-        element_id = element.add()
-    element_set = ElementSet(datafile, "elements", Element)
+def test_04_10_delete_element(element_set):
+    length = NUMBER_ELEMENTS
     assert length == len(element_set.get_property_set())
     third_element_index = 2
     element_set.delete(third_element_index)
     new_set = element_set.get_property_set()
     assert len(new_set) == length - 1
     assert new_set[third_element_index].get_record_id() == 4
-    datafile_close(datafile)
 
 
-def test_04_11_build_option_list(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    remark = "Remark # "
-    element_values = {"record_id": 1, "remarks": remark}
-    number_elements = 5
-    for i in range(number_elements):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element = new_element(datafile, element_values)
-        element_id = element.add()
-    element_set = ElementSet(datafile, "elements", Element)
+def test_04_11_build_option_list(element_set):
     properties = element_set.get_property_set()
-    assert len(properties) == number_elements
+    assert len(properties) == NUMBER_ELEMENTS
     # build an option list
     option_list = element_set.build_option_list("record_id")
     assert len(option_list) == 5
@@ -205,27 +158,14 @@ def test_04_11_build_option_list(filesystem):
     for record_id in option_list:
         assert record_id == str(i)
         i += 1
-    datafile_close(datafile)
 
 
-def test_04_12_iterator(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
-    element = Element(datafile, "elements")
-    remark = "Remark # "
-    element_values = {"record_id": 1, "remarks": remark}
-    for i in range(5):  # put 5 entries in the table
-        element_values["remarks"] = remark + str(5 - i)
-        element.set_initial_values(element_values)
-        element.set_properties(element_values)
-        element_id = element.add()
+def test_04_12_iterator(element_set):
     i = 1
-    element_set = ElementSet(datafile, "elements", Element)
     for row in element_set:
         assert row.get_record_id() == i
         i += 1
-    datafile_close(datafile)
 
 
-def test_04_13_get_type(filesystem):
-    filename, datafile, element_set = base_setup(filesystem)
+def test_04_13_get_type(element_set):
     assert element_set.get_type() == Element
@@ -9,12 +9,12 @@ Copyright:  (c) 2022, 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
+import configparser
+import io
 import os
 import sys
 
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
+import pytest
 
 from lbk_library import IniFileParser
 
@@ -45,6 +45,12 @@ sample_config = {
 }
 
 
+@pytest.fixture
+def parser(tmpdir):
+    """An IniFileParser for 'testfile.ini' in a per test directory."""
+    return IniFileParser("testfile.ini", tmpdir.join("testfile"))
+
+
 def test_05_01_bare_constructor_get_config_dir_path():
     # Verify the config path exists
     filename = "testfile.ini"
@@ -81,38 +87,29 @@ def test_05_03_constructor(tmpdir):
     # end test_03_constructor()
 
 
-def test_05_04_read_empty_config(tmpdir):
-    filename = "testfile.ini"
-    subdir = tmpdir.join("testfile")
-    parser = IniFileParser(filename, subdir)
+def test_05_04_read_empty_config(parser):
     config = parser.read_config()
     assert isinstance(config, dict)
     assert len(config) == 0
     # end test_04_read_empty_config()
 
 
-def test_05_05_write_empty_config(tmpdir):
-    filename = "testfile.ini"
-    subdir = tmpdir.join("testfile")
+def test_05_05_write_empty_config(parser):
     # write and check empty file
     ini_file = {}
-    parser = IniFileParser(filename, subdir)
     parser.write_config(ini_file)
     assert os.path.exists(parser.config_file)
     assert os.path.getsize(parser.config_file) == 0
     # read and check the empty file
-    parser = IniFileParser(filename, subdir)
+    parser = IniFileParser("testfile.ini", os.path.dirname(parser.config_file))
     config = parser.read_config()
     assert isinstance(config, dict)
     assert len(config) == 0
     # end test_05_write_empty_config()
 
 
-def test_05_06_write_config(tmpdir):
-    filename = "testfile.ini"
-    subdir = tmpdir.join("testfile")
+def test_05_06_write_config(parser):
     # write and check sample file
-    parser = IniFileParser(filename, subdir)
     parser.write_config(sample_config)
     assert os.path.exists(parser.config_file)
     # get sample file and verify same as sample_config
@@ -123,4 +120,60 @@ def test_05_06_write_config(tmpdir):
     # end test_06_write_config()
 
 
+def test_05_07_read_config_cached(parser):
+    parser.write_config(sample_config)
+    config = parser.read_config()
+    # changing the returned settings does not change the next read
+    config["section_1"]["data_1"] = "20"
+    config["section_4"] = {}
+    assert parser.read_config() == sample_config
+    # a new write is seen by the next read
+    new_config = {"section_1": {"data_1": "30"}}
+    parser.write_config(new_config)
+    assert parser.read_config() == new_config
+    # as is a change made outside the parser
+    other_parser = IniFileParser("testfile.ini", os.path.dirname(parser.config_file))
+    other_parser.write_config(sample_config)
+    assert parser.read_config() == sample_config
+    # end test_07_read_config_cached()
+
+
+def test_05_08_write_config_format(parser):
+    test_configs = [
+        sample_config,
+        {"Section": {"Key": 5, "no_value": None, "empty": "", "multi": "a\nb"}},
+        # these go through configparser
+        {"DEFAULT": {"shared": "1"}, "section_1": {"data_1": "2"}},
+        {"section_1": {"percent": "100%%"}},
+    ]
+    for test_config in test_configs:
+        config_parser = configparser.ConfigParser(allow_no_value=True)
+        config_parser.read_dict(test_config)
+        expected = io.StringIO()
+        config_parser.write(expected)
+        parser.write_config(test_config)
+        with open(parser.config_file, encoding="utf-8") as config_file:
+            assert config_file.read() == expected.getvalue()
+    # end test_08_write_config_format()
+
+
+def test_05_09_rejected_write_keeps_file(parser):
+    old_config = {"s": {"a": "1"}}
+    parser.write_config(old_config)
+    # a lone '%' is not a valid configparser value
+    with pytest.raises(ValueError):
+        parser.write_config({"s": {"a": "100%"}})
+    assert parser.read_config() == old_config
+    # end test_09_rejected_write_keeps_file()
+
+
+def test_05_10_read_locale_encoded_config(parser, monkeypatch):
+    # a file saved in a locale encoding that is not utf-8
+    monkeypatch.setattr("locale.getpreferredencoding", lambda do_setlocale: "cp1252")
+    with open(parser.config_file, "w", encoding="cp1252") as config_file:
+        config_file.write("[s]\nname = caf\u00e9\n")
+    assert parser.read_config() == {"s": {"name": "caf\u00e9"}}
+    # end test_10_read_locale_encoded_config()
+
+
 # end testlbk_library_05_inifileparser.py
@@ -7,13 +7,6 @@ Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
 from PySide6.QtWidgets import QFrame
 from pytestqt import qtbot
 
@@ -40,3 +33,15 @@ def test_06_02_error_property(qtbot):
     frame.error = False
     assert not frame.error
     assert frame.styleSheet() == frame._frame_style_normal
+
+
+def test_06_03_unchanged_error(qtbot, mocker):
+    frame = ErrorFrame()
+    qtbot.addWidget(frame)
+    set_style = mocker.spy(frame, "setStyleSheet")
+    frame.error = False
+    assert set_style.call_count == 0
+    frame.error = True
+    frame.error = True
+    assert set_style.call_count == 1
+    assert frame.styleSheet() == frame._frame_style_error
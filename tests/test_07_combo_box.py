@@ -7,13 +7,6 @@ Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
 from PySide6.QtWidgets import QComboBox
 from pytestqt import qtbot
 
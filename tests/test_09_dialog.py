@@ -7,13 +7,6 @@ Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
 from PySide6.QtWidgets import QDialog, QMainWindow, QMessageBox
 from test_setup import (
     DummyForm,
@@ -172,6 +165,30 @@ def test_09_10_msg_warning_invalid(filesystem, qtbot):
     datafile_close(datafile)
 
 
+def test_09_10a_msg_box_not_shared(filesystem, qtbot):
+    dialog, main, datafile = base_setup(filesystem, qtbot)
+    msg_box = dialog.message_warning_invalid()
+    msg_box.setInformativeText("informative")
+    msg_box.setDetailedText("details")
+    msg_box.setDefaultButton(QMessageBox.StandardButton.Ok)
+    msg_box.setEscapeButton(QMessageBox.StandardButton.Ok)
+    # the next message does not carry the first box's settings
+    msg_box2 = dialog.message_question_no_changes()
+    assert msg_box2 is not msg_box
+    assert msg_box2.icon() == QMessageBox.Icon.Question
+    assert msg_box2.windowTitle() == "Form Entries Have Not Changed"
+    assert msg_box2.text() == "Nothing has changed, so nothing to save"
+    assert msg_box2.standardButtons() == QMessageBox.StandardButton.Ok
+    assert msg_box2.informativeText() == ""
+    assert msg_box2.detailedText() == ""
+    assert msg_box2.defaultButton() is None
+    assert msg_box2.escapeButton() is None
+    # and the first box keeps its own message
+    assert msg_box.windowTitle() == "Form Entries Invalid"
+    assert msg_box.informativeText() == "informative"
+    datafile_close(datafile)
+
+
 def test_09_11_action_cancel(filesystem, qtbot, mocker):
     dialog, main, datafile = base_setup(filesystem, qtbot)
     dialog.form = DummyForm(dialog)
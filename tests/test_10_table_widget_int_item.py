@@ -7,13 +7,7 @@ Copyright:  (c) 20243 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
-
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
+import pytest
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QTableWidgetItem
 
@@ -43,3 +37,46 @@ def test_10_02_less_thane():
     assert test_list[0] == widget_1
     assert test_list[1] == widget_3
     assert test_list[2] == widget_2
+
+
+def test_10_03_less_than_after_set_text():
+    widget_1 = TableWidgetIntItem(10)
+    widget_2 = TableWidgetIntItem(20)
+    widget_1.setText("30")
+    assert widget_2 < widget_1
+    assert not widget_1 < widget_2
+
+
+def test_10_04_less_than_plain_item():
+    widget_1 = TableWidgetIntItem(10)
+    assert widget_1 < QTableWidgetItem("11")
+    assert not widget_1 < QTableWidgetItem("9")
+
+
+def test_10_05_less_than_numeric_strings():
+    # numeric strings compare as integers, also against int items
+    assert TableWidgetIntItem("9") < TableWidgetIntItem("12")
+    assert not TableWidgetIntItem("12") < TableWidgetIntItem("9")
+    assert TableWidgetIntItem(10) < TableWidgetIntItem("11")
+    assert not TableWidgetIntItem("11") < TableWidgetIntItem(10)
+    widget_1 = TableWidgetIntItem(10)
+    widget_1.setData(Qt.ItemDataRole.EditRole, "25")
+    assert TableWidgetIntItem(20) < widget_1
+
+
+def test_10_06_less_than_float():
+    # a float is not truncated, it is rejected like its text
+    widget_1 = TableWidgetIntItem(10)
+    widget_1.setData(Qt.ItemDataRole.DisplayRole, 2.9)
+    assert widget_1.text() == "2.9"
+    with pytest.raises(ValueError):
+        widget_1 < TableWidgetIntItem(3)
+    with pytest.raises(ValueError):
+        TableWidgetIntItem(2.9) < TableWidgetIntItem(3)
+
+
+def test_10_07_int_value_slot():
+    # the cached integer lives in the slot, not the instance dict
+    widget_1 = TableWidgetIntItem(10)
+    assert widget_1.__dict__ == {}
+    assert widget_1._int_value == 10
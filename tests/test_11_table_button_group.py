@@ -7,17 +7,9 @@ Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file License
 """
 
-import os
-import sys
-
 from PyQt5.QtWidgets import QFrame, QTableWidget
 from pytestqt import qtbot
 
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
-
 from lbk_library.gui import TableButtonGroup, TablePushButton
 
 # group Id Constants
@@ -7,15 +7,10 @@ Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
 """
 
-import os
-import sys
 from copy import deepcopy
 
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
-from PySide6.QtCore import QAbstractTableModel, Qt  # QModelIndex,
+import pytest
+from PySide6.QtCore import QAbstractItemModel, QAbstractTableModel, QModelIndex, Qt
 from PySide6.QtGui import QBrush, QColor
 from test_setup import datafile_name
 
@@ -89,6 +84,22 @@ def test_11_01_class_type(qtbot, filesystem):
     datafile_close(datafile)
 
 
+def test_11_01a_default_background(qtbot):
+    model_1 = TableModel(test_value_set, header_names, tool_tips, cell_alignments)
+    model_2 = TableModel(test_value_set, header_names, tool_tips, cell_alignments)
+    assert model_1._data_set[0][0].background == normal_background
+    assert model_1._data_set[0][0].background is model_2._data_set[1][2].background
+
+
+def test_11_01b_cell_data_slots():
+    cell = CellData("a value")
+    assert not hasattr(cell, "__dict__")
+    assert cell.value == "a value"
+    assert cell.alignment is None
+    assert cell.background is None
+    assert cell.tooltip is None
+
+
 def test_11_02_rowCount(qtbot, filesystem):
     datafile, model = setup_table_model(qtbot, filesystem)
     assert model.rowCount() == len(test_value_set)
@@ -111,6 +122,7 @@ def test_11_04_flags(qtbot, filesystem):
             assert flags & Qt.ItemFlag.ItemIsEnabled
             if column != header_names.index("Record Id"):
                 assert flags & Qt.ItemFlag.ItemIsEditable
+    assert not model.flags(QModelIndex()) & Qt.ItemFlag.ItemIsEditable
     datafile_close(datafile)
 
 
@@ -121,6 +133,12 @@ def test_11_05_header_data(qtbot, filesystem):
             model.headerData(column, Qt.Orientation.Horizontal)
             == model._header_titles[column]
         )
+    assert model.headerData(model.columnCount(), Qt.Orientation.Horizontal) is None
+    assert model.headerData(-1, Qt.Orientation.Horizontal) is None
+    assert (
+        model.headerData(0, Qt.Orientation.Horizontal, Qt.ItemDataRole.ToolTipRole)
+        is None
+    )
     datafile_close(datafile)
 
 
@@ -147,6 +165,12 @@ def test_11_07_insert_rows(qtbot, filesystem):
     success = model.insertRows(1, 2)
     assert model.rowCount() == current_rows + 2
     assert success
+    assert model._data_set[0][0].value == test_value_set[0][0]
+    assert model._data_set[1][0].value is None
+    assert model._data_set[2][0].value is None
+    assert model._data_set[3][0].value == test_value_set[1][0]
+    assert len(model._data_set[1]) == len(test_value_set[0])
+    assert model._data_set[1][0] is not model._data_set[2][0]
     datafile_close(datafile)
 
 
@@ -158,11 +182,30 @@ def test_11_08_remove_rows(qtbot, filesystem):
     assert isinstance(model._data_set[2][0], CellData)
     assert not model._data_set[3][0].value == None
 
+    removed = []
+    model.rowsAboutToBeRemoved.connect(
+        lambda parent, first, last: removed.append((first, last))
+    )
     success = model.removeRows(1, 1)
     assert model.rowCount() == current_rows - 1
     assert model._data_set[1][0].value == None
     assert not model._data_set[2][0].value == None
     assert success
+    assert removed == [(1, 1)]
+
+    # several rows at once
+    success = model.removeRows(0, 2)
+    assert success
+    assert model.rowCount() == current_rows - 3
+    assert model._data_set[0][0].value == test_value_set[1][0]
+    assert removed == [(1, 1), (0, 1)]
+
+    # rows outside the table
+    assert not model.removeRows(model.rowCount() - 1, 2)
+    assert not model.removeRows(-1, 1)
+    assert not model.removeRows(0, 0)
+    assert model.rowCount() == current_rows - 3
+    assert removed == [(1, 1), (0, 1)]
     datafile_close(datafile)
 
 
@@ -244,3 +287,163 @@ def test_11_10_setData(qtbot, filesystem):
     new_alignment = cell_alignments[1]
     assert model.setData(myindex, new_alignment, Qt.ItemDataRole.TextAlignmentRole)
     assert model.data(myindex, Qt.ItemDataRole.TextAlignmentRole) == cell_alignments[1]
+
+    # invalid indexes are neither stored nor returned
+    last_cell = model._data_set[-1][-1]
+    assert not model.setData(QModelIndex(), "a value")
+    assert last_cell.value != "a value"
+    last_cell.value = "last value"
+    assert model.data(QModelIndex()) is None
+
+    # unsupported roles are neither stored nor returned
+    assert not model.setData(myindex, "icon", Qt.ItemDataRole.DecorationRole)
+    assert model.data(myindex, Qt.ItemDataRole.DecorationRole) is None
+
+
+def test_11_11_bulk_update(qtbot, filesystem):
+    datafile, model = setup_table_model(qtbot, filesystem)
+    changed = []
+    changed_roles = []
+
+    def action_data_changed(top_left, bottom_right, roles):
+        changed.append(
+            (
+                top_left.row(),
+                top_left.column(),
+                bottom_right.row(),
+                bottom_right.column(),
+            )
+        )
+        changed_roles.append(list(roles))
+
+    model.dataChanged.connect(action_data_changed)
+
+    # explicit begin/end, nested
+    model.begin_bulk_update()
+    model.setData(model.createIndex(1, 2), "a value")
+    model.begin_bulk_update()
+    model.setData(model.createIndex(0, 3), "another value")
+    model.end_bulk_update()
+    assert changed == []
+    model.setData(model.createIndex(1, 1), "a third value")
+    model.setData(model.createIndex(1, 1), "a tooltip", Qt.ItemDataRole.ToolTipRole)
+    model.end_bulk_update()
+    assert changed == [(0, 1, 1, 3)]
+    assert changed_roles == [[Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole]]
+    assert model.data(model.createIndex(1, 2)) == "a value"
+    assert model.data(model.createIndex(0, 3)) == "another value"
+    assert model.data(model.createIndex(1, 1)) == "a third value"
+
+    # context manager, no changes means no signal
+    changed.clear()
+    with model.bulk_update():
+        pass
+    assert changed == []
+    with model.bulk_update() as bulk_model:
+        assert bulk_model is model
+        model.setData(model.createIndex(0, 0), 5)
+    assert changed == [(0, 0, 0, 0)]
+
+    # outside a bulk update, each change is signaled
+    changed.clear()
+    changed_roles.clear()
+    model.setData(model.createIndex(0, 0), 6)
+    model.setData(model.createIndex(1, 0), 7, Qt.ItemDataRole.DisplayRole)
+    assert changed == [(0, 0, 0, 0), (1, 0, 1, 0)]
+    assert changed_roles == [[Qt.ItemDataRole.EditRole], [Qt.ItemDataRole.DisplayRole]]
+    datafile_close(datafile)
+
+
+def test_11_12_layout_update(qtbot, filesystem):
+    datafile, model = setup_table_model(qtbot, filesystem)
+    hints = []
+    signature = (
+        "QList<QPersistentModelIndex>",
+        "QAbstractItemModel::LayoutChangeHint",
+    )
+    model.layoutAboutToBeChanged[signature].connect(
+        lambda parents, hint: hints.append(hint)
+    )
+    model.layoutChanged[signature].connect(lambda parents, hint: hints.append(hint))
+
+    first_value = model.data(model.createIndex(0, 0))
+    with model.layout_update() as layout_model:
+        assert layout_model is model
+        assert len(hints) == 1
+        model._data_set.reverse()
+    assert model.data(model.createIndex(model.rowCount() - 1, 0)) == first_value
+    sort_hint = QAbstractItemModel.LayoutChangeHint.VerticalSortHint
+    assert hints == [sort_hint, sort_hint]
+    datafile_close(datafile)
+
+
+def test_11_13_from_provider(qtbot):
+    requested = []
+
+    def provider(row):
+        requested.append(row)
+        return [row, "name " + str(row), "species", row % 3]
+
+    model = TableModel.from_provider(
+        provider, 1000, header_names, tool_tips, cell_alignments, cache_size=4
+    )
+    assert model.rowCount() == 1000
+    assert model.columnCount() == len(header_names)
+    assert requested == []
+
+    # rows are built on first use and then cached
+    assert model.data(model.createIndex(10, 1)) == "name 10"
+    assert model.data(model.createIndex(10, 0)) == 10
+    assert (
+        model.data(model.createIndex(10, 1), Qt.ItemDataRole.ToolTipRole)
+        == tool_tips[1]
+    )
+    assert (
+        model.data(model.createIndex(10, 1), Qt.ItemDataRole.BackgroundRole)
+        == normal_background
+    )
+    assert requested == [10]
+
+    # least recently used rows are dropped from the cache
+    for row in range(4):
+        model.data(model.createIndex(row, 0))
+    assert len(model._data_set._row_cache) == 4
+    model.data(model.createIndex(10, 0))
+    assert requested == [10, 0, 1, 2, 3, 10]
+
+    # edited rows are kept
+    model.setData(model.createIndex(500, 1), "new name")
+    for row in range(4):
+        model.data(model.createIndex(row, 0))
+    assert model.data(model.createIndex(500, 1)) == "new name"
+    assert requested.count(500) == 1
+
+    # rows cannot be added or removed
+    assert not model.insertRows(0, 1)
+    assert not model.removeRows(0, 1)
+    assert model.rowCount() == 1000
+
+
+def test_11_13a_from_provider_cache_size(qtbot):
+    def provider(row):
+        return [row, "name " + str(row), "species", row % 3]
+
+    # the cache must hold at least one row
+    with pytest.raises(ValueError):
+        TableModel.from_provider(
+            provider, 10, header_names, tool_tips, cell_alignments, cache_size=0
+        )
+
+    # with a single row cache, edits survive the row leaving the cache
+    model = TableModel.from_provider(
+        provider, 10, header_names, tool_tips, cell_alignments, cache_size=1
+    )
+    index = model.createIndex(3, 1)
+    assert model.setData(index, "EDIT")
+    assert model.data(index) == "EDIT"
+    model.data(model.createIndex(4, 1))
+    model.data(model.createIndex(5, 1))
+    assert model.data(index) == "EDIT"
+    assert model.setData(model.createIndex(4, 1), "EDIT 4")
+    assert model.data(model.createIndex(4, 1)) == "EDIT 4"
+    assert model.data(index) == "EDIT"
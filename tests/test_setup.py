@@ -16,14 +16,8 @@ Copyright:  (c) 2022, 2023 Lorn B Kerr
  License:    MIT, see file LICENSE
  """
 
-import os
-import sys
 from typing import Any
 
-src_path = os.path.join(os.path.realpath("."), "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
-
 from PySide6.QtWidgets import QPushButton
 
 from lbk_library import DataFile, Element, ElementSet